@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import UserProfile
+from .models import AvailabilityException, AvailabilitySlot, UserProfile
 
 
 @admin.register(UserProfile)
@@ -7,3 +7,17 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'user_type', 'average_rating', 'review_count', 'created_at']
     list_filter = ['user_type', 'created_at']
     search_fields = ['user__username', 'user__email']
+
+
+@admin.register(AvailabilitySlot)
+class AvailabilitySlotAdmin(admin.ModelAdmin):
+    list_display = ['mentor', 'weekday', 'start_time', 'end_time']
+    list_filter = ['weekday']
+    search_fields = ['mentor__user__username']
+
+
+@admin.register(AvailabilityException)
+class AvailabilityExceptionAdmin(admin.ModelAdmin):
+    list_display = ['mentor', 'start', 'end', 'is_available', 'note']
+    list_filter = ['is_available']
+    search_fields = ['mentor__user__username']
@@ -0,0 +1,69 @@
+"""JWT authentication that skips the per-request user and profile queries.
+
+Access tokens carry a ``profile_id`` claim (see
+``ProfileTokenObtainPairSerializer``). The ``User`` row is cached for a short
+time, keyed by user id, and dropped whenever the user or their profile is
+saved. ``request.user.userprofile`` is built from the ``profile_id`` claim with
+every other field deferred, so views that only filter or compare by profile
+never query it, and the first other field access loads the whole row at once.
+Tokens issued before the claim existed fall back to the normal lazy lookup.
+The role is deliberately not a claim: ``user_type`` can be changed through the
+profile endpoint, and an access token would keep the old value until it expires.
+
+``authenticate_async`` does the same for plain async views.
+"""
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import UserProfile
+
+USER_CACHE_TIMEOUT = 60
+PROFILE_ID_CLAIM = 'profile_id'
+
+
+def user_cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            # The uncached path runs simplejwt's own existence, is_active and revocation checks.
+            user = super().get_user(validated_token)
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        elif not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        profile_id = validated_token.get(PROFILE_ID_CLAIM)
+        if profile_id is not None:
+            UserProfile.attach_deferred(user, profile_id)
+        return user
+
+
+async def authenticate_async(request):
+    """The user behind the request's JWT, or None."""
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        validated_token = authentication.get_validated_token(raw_token)
+        return await sync_to_async(authentication.get_user)(validated_token)
+    except (InvalidToken, AuthenticationFailed):
+        return None
@@ -0,0 +1,87 @@
+"""Resized, metadata-free variants of uploaded profile images.
+
+Each upload is decoded once and written as a square thumbnail per size in
+WebP and JPEG. Files are named by a hash of their bytes, so a URL never
+changes content and can be cached forever (see ``profile_image_variant``),
+and re-processing the same upload rewrites nothing.
+"""
+import hashlib
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = 'profile_images/variants'
+# name -> edge length in pixels; images smaller than that are not upscaled.
+IMAGE_SIZES = {'small': 64, 'medium': 256, 'large': 512}
+IMAGE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+CONTENT_TYPES = {'webp': 'image/webp', 'jpg': 'image/jpeg'}
+
+
+def decode(file):
+    image = Image.open(file)
+    # JPEGs can decode straight to a reduced scale, which is most of the cost for large photos.
+    largest = max(IMAGE_SIZES.values())
+    image.draft('RGB', (largest, largest))
+    # Apply the EXIF rotation before the metadata carrying it is dropped.
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        rgba = image.convert('RGBA')
+        image = Image.new('RGB', rgba.size, 'white')
+        image.paste(rgba, mask=rgba.getchannel('A'))
+    return image.convert('RGB')
+
+
+def encode(image, fmt):
+    pillow_format, options = IMAGE_FORMATS[fmt]
+    buffer = BytesIO()
+    # Nothing from the source's info (EXIF, ICC, XMP) is passed on, so none of it is written.
+    image.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+def store(data, fmt):
+    name = f'{VARIANT_DIR}/{hashlib.sha256(data).hexdigest()[:32]}.{EXTENSIONS[fmt]}'
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(data))
+    return name
+
+
+def build_variants(file):
+    """Write every size and format of the image in ``file``; returns ``{size: {format: storage name}}``."""
+    image = decode(file)
+    variants = {}
+    for size, edge in IMAGE_SIZES.items():
+        edge = min(edge, *image.size)
+        thumbnail = ImageOps.fit(image, (edge, edge), Image.Resampling.LANCZOS)
+        variants[size] = {fmt: store(encode(thumbnail, fmt), fmt) for fmt in IMAGE_FORMATS}
+    return variants
+
+
+def process_profile_image(profile_id, image_name):
+    """Build the variants of ``image_name`` and store them on the profile if that is still its image.
+
+    Returns the variants, or None if the profile moved on or the file is not a usable image.
+    """
+    from .models import UserProfile
+
+    try:
+        with default_storage.open(image_name) as file:
+            variants = build_variants(file)
+    except FileNotFoundError:
+        return None
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        logger.warning('Could not process profile image %s of profile %s', image_name, profile_id, exc_info=True)
+        return None
+    # Conditional on the image name, so a slow task never overwrites the variants of a newer upload.
+    if not UserProfile.objects.set_image_variants(profile_id, image_name, variants):
+        return None
+    return variants
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from accounts.images import process_profile_image
+from accounts.models import UserProfile
+from accounts.tasks import build_profile_image_variants
+
+
+class Command(BaseCommand):
+    help = 'Build thumbnail variants for profile images that do not have them yet (or all of them with --all).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Reprocess images that already have variants.')
+        parser.add_argument('--queue', action='store_true', help='Queue Celery tasks instead of processing here.')
+
+    def handle(self, *args, **options):
+        profiles = UserProfile.objects.exclude(profile_image='').exclude(profile_image__isnull=True)
+        if not options['all']:
+            profiles = profiles.filter(profile_image_variants={})
+
+        processed = failed = 0
+        for profile_id, image_name in profiles.order_by('pk').values_list('pk', 'profile_image').iterator():
+            if options['queue']:
+                build_profile_image_variants.delay(profile_id, image_name)
+                processed += 1
+            elif process_profile_image(profile_id, image_name) is None:
+                failed += 1
+            else:
+                processed += 1
+        verb = 'Queued' if options['queue'] else 'Processed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {processed} profile images, {failed} failed'))
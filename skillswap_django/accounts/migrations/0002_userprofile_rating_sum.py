@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+def derive_rating_sum(apps, schema_editor):
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    UserProfile.objects.filter(review_count__gt=0).update(
+        rating_sum=models.functions.Round(models.F('average_rating') * models.F('review_count'))
+    )
+
+
+def derive_average_rating(apps, schema_editor):
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    UserProfile.objects.filter(review_count__gt=0).update(
+        average_rating=models.functions.Cast('rating_sum', models.FloatField()) / models.F('review_count')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(derive_rating_sum, derive_average_rating),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='average_rating',
+        ),
+    ]
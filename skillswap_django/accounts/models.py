@@ -1,6 +1,30 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+from skillswap_backend.cache import invalidate
+
+
+class UserProfileManager(models.Manager):
+    def adjust_rating(self, profile_id, rating_delta, count_delta=0):
+        """Apply a review's effect on the rating counters in one atomic UPDATE."""
+        updated = self.filter(pk=profile_id).update(
+            rating_sum=models.F('rating_sum') + rating_delta,
+            review_count=models.F('review_count') + count_delta,
+            # The average rating is part of the profile's representation.
+            updated_at=timezone.now(),
+        )
+        invalidate('profiles')
+        return updated
+
+    def set_image_variants(self, profile_id, image_name, variants):
+        """Store the processed variants of ``image_name``, unless the profile has another image by now."""
+        updated = self.filter(pk=profile_id, profile_image=image_name).update(
+            profile_image_variants=variants, updated_at=timezone.now(),
+        )
+        if updated:
+            invalidate('profiles')
+        return updated
 
 
 class UserProfile(models.Model):
@@ -13,11 +37,104 @@ class UserProfile(models.Model):
     user_type = models.CharField(max_length=10, choices=USER_TYPES, default='LEARNER')
     bio = models.TextField(blank=True, null=True)
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
+    # {size: {format: storage name}}, filled in by the build_profile_image_variants task.
+    profile_image_variants = models.JSONField(default=dict, blank=True)
     timezone = models.CharField(max_length=50, default='UTC')
-    average_rating = models.FloatField(default=0.0)
+    rating_sum = models.IntegerField(default=0)
     review_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserProfileManager()
+
+    # Maintained only through UserProfileManager.adjust_rating().
+    COUNTER_FIELDS = ('rating_sum', 'review_count')
+
     def __str__(self):
         return f"{self.user.username} ({self.get_user_type_display()})"
+
+    @property
+    def display_name(self):
+        return self.user.get_full_name() or self.user.username
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.review_count if self.review_count else 0.0
+
+    @classmethod
+    def attach_deferred(cls, user, profile_id):
+        """Set ``user.userprofile`` to a profile with only its id loaded, without querying."""
+        profile = cls.from_db(None, ['id', 'user_id'], [profile_id, user.pk])
+        user_field = cls._meta.get_field('user')
+        user_field.set_cached_value(profile, user)
+        user_field.remote_field.set_cached_value(user, profile)
+        return profile
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Touching one deferred field of a deferred profile loads all of them in one query.
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and deferred.issuperset(fields):
+            fields = deferred
+        super().refresh_from_db(using, fields, from_queryset)
+
+    def save(self, *args, **kwargs):
+        # Never write back a stale in-memory copy of the rating counters.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class AvailabilitySlot(models.Model):
+    """A weekly window in which a mentor takes sessions, in the mentor's own timezone."""
+    WEEKDAYS = (
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    )
+
+    mentor = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='availability_slots')
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAYS)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        ordering = ['weekday', 'start_time']
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end_time__gt=models.F('start_time')), name='availability_slot_end_after_start'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.mentor.user.username}: {self.get_weekday_display()} {self.start_time}-{self.end_time}"
+
+
+class AvailabilityException(models.Model):
+    """A one-off change to the weekly slots: time off, or extra hours when ``is_available``."""
+    mentor = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='availability_exceptions')
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    is_available = models.BooleanField(default=False)
+    note = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        ordering = ['start']
+        indexes = [
+            models.Index(fields=['mentor', 'end'], name='availability_exc_mentor_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end__gt=models.F('start')), name='availability_exception_end_after_start'
+            ),
+        ]
+
+    def __str__(self):
+        kind = 'available' if self.is_available else 'unavailable'
+        return f"{self.mentor.user.username}: {kind} {self.start} - {self.end}"
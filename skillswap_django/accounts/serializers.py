@@ -1,6 +1,12 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.models import User
-from .models import UserProfile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from skillswap_backend.fieldsets import SparseFieldsMixin
+from .authentication import PROFILE_ID_CLAIM
+from .models import AvailabilityException, AvailabilitySlot, UserProfile
+from .tasks import schedule_profile_image_processing
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -9,14 +15,71 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    profile_image_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = UserProfile
-        fields = ['id', 'user', 'user_type', 'bio', 'profile_image', 'timezone', 
+        fields = ['id', 'user', 'user_type', 'bio', 'profile_image', 'profile_image_variants', 'timezone', 
                  'average_rating', 'review_count', 'created_at', 'updated_at']
 
+    def get_profile_image_variants(self, obj):
+        """``{size: {format: url}}``; empty until the uploaded image has been processed."""
+        request = self.context.get('request')
+        variants = {}
+        for size, formats in obj.profile_image_variants.items():
+            urls = {fmt: default_storage.url(name) for fmt, name in formats.items()}
+            if request is not None:
+                urls = {fmt: request.build_absolute_uri(url) for fmt, url in urls.items()}
+            variants[size] = urls
+        return variants
+
+    def update(self, instance, validated_data):
+        image_changed = 'profile_image' in validated_data
+        if image_changed:
+            # The old variants show the previous image; clients use the original until new ones exist.
+            validated_data['profile_image_variants'] = {}
+        profile = super().update(instance, validated_data)
+        if image_changed:
+            schedule_profile_image_processing(profile)
+        return profile
+
+
+class ProfileSummarySerializer(serializers.ModelSerializer):
+    """Compact form used for nested profiles unless they are requested with ``?expand=``."""
+    display_name = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = UserProfile
+        fields = ['id', 'display_name']
+
+
+class AvailabilitySlotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AvailabilitySlot
+        fields = ['id', 'weekday', 'start_time', 'end_time']
+
+    def validate(self, attrs):
+        start_time = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        if start_time and end_time and end_time <= start_time:
+            raise serializers.ValidationError("end_time must be after start_time")
+        return attrs
+
+
+class AvailabilityExceptionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AvailabilityException
+        fields = ['id', 'start', 'end', 'is_available', 'note']
+
+    def validate(self, attrs):
+        start = attrs.get('start', getattr(self.instance, 'start', None))
+        end = attrs.get('end', getattr(self.instance, 'end', None))
+        if start and end and end <= start:
+            raise serializers.ValidationError("end must be after start")
+        return attrs
+
 
 class RegisterSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -40,11 +103,29 @@ class RegisterSerializer(serializers.Serializer):
         timezone = validated_data.pop('timezone', 'UTC')
         validated_data.pop('password_confirm')
         
-        user = User.objects.create_user(**validated_data)
-        profile = UserProfile.objects.create(
-            user=user,
-            user_type=user_type,
-            bio=bio,
-            timezone=timezone
-        )
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(**validated_data)
+                profile = UserProfile.objects.create(
+                    user=user,
+                    user_type=user_type,
+                    bio=bio,
+                    timezone=timezone
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({'username': ['A user with that username already exists.']})
         return profile
+
+
+class ProfileTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds the profile id claim that ``CachedJWTAuthentication`` reads."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        try:
+            profile = user.userprofile
+        except UserProfile.DoesNotExist:
+            return token
+        token[PROFILE_ID_CLAIM] = profile.pk
+        return token
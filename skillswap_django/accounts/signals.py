@@ -0,0 +1,24 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django.db import transaction
+from skillswap_backend.cache import invalidate
+from .authentication import forget_user
+from .models import UserProfile
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+@receiver([post_save, post_delete], sender=User)
+def invalidate_profiles(sender, **kwargs):
+    invalidate('profiles')
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_user(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def forget_cached_profile_user(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_user(instance.user_id))
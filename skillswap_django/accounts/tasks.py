@@ -0,0 +1,33 @@
+import logging
+
+from celery import shared_task
+from django.db import transaction
+
+from . import images
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_profile_image_processing(profile):
+    """Queue the variants of the profile's current image for building once the transaction commits."""
+    if not profile.profile_image:
+        return
+    profile_id, image_name = profile.pk, profile.profile_image.name
+
+    def enqueue():
+        try:
+            build_profile_image_variants.delay(profile_id, image_name)
+        except Exception:
+            # Until it runs, clients fall back to the original image; process_profile_images catches up.
+            logger.exception('Could not queue image processing for profile %s', profile_id)
+
+    transaction.on_commit(enqueue)
+
+
+@shared_task
+def build_profile_image_variants(profile_id, image_name):
+    """Resize an uploaded profile image into its thumbnail variants"""
+    variants = images.process_profile_image(profile_id, image_name)
+    if variants is None:
+        return f"Profile {profile_id} image {image_name} not processed"
+    return f"Built {sum(len(formats) for formats in variants.values())} variants for profile {profile_id}"
@@ -1,11 +1,19 @@
-from rest_framework import generics, status
+from rest_framework import generics, status, viewsets
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+from django.views.decorators.http import condition, require_safe
 from rest_framework_simplejwt.views import TokenObtainPairView
-from django.contrib.auth.models import User
-from .models import UserProfile
-from .serializers import RegisterSerializer, UserProfileSerializer
+from skillswap_backend.conditional import not_modified, timestamp_validators, with_validators
+from .images import CONTENT_TYPES, VARIANT_DIR
+from .models import AvailabilityException, AvailabilitySlot, UserProfile
+from .serializers import (
+    AvailabilityExceptionSerializer, AvailabilitySlotSerializer, ProfileTokenObtainPairSerializer, RegisterSerializer,
+    UserProfileSerializer,
+)
 
 
 class RegisterView(generics.GenericAPIView):
@@ -16,13 +24,11 @@ class RegisterView(generics.GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         
         if not serializer.is_valid():
-            print("Registration error:", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         profile = serializer.save()
 
-        from rest_framework_simplejwt.tokens import RefreshToken
-        refresh = RefreshToken.for_user(profile.user)
+        refresh = ProfileTokenObtainPairSerializer.get_token(profile.user)
 
         response_data = {
             'access': str(refresh.access_token),
@@ -34,13 +40,20 @@ class RegisterView(generics.GenericAPIView):
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
+    serializer_class = ProfileTokenObtainPairSerializer
+
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        if response.status_code == 200:
-            user = User.objects.get(username=request.data['username'])
-            profile_data = UserProfileSerializer(user.userprofile).data
-            response.data['user'] = profile_data
-        return response
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        # ProfileModelBackend loaded the profile along with the user.
+        profile = getattr(serializer.user, 'userprofile', None)
+        response_data = dict(serializer.validated_data)
+        response_data['user'] = UserProfileSerializer(profile).data if profile else None
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 @api_view(['GET', 'PUT'])
@@ -52,8 +65,12 @@ def profile_view(request):
         return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == 'GET':
-        serializer = UserProfileSerializer(profile)
-        return Response(serializer.data)
+        validators = timestamp_validators(request, [profile.updated_at])
+        response = not_modified(request, *validators)
+        if response is None:
+            serializer = UserProfileSerializer(profile, context={'request': request})
+            response = Response(serializer.data)
+        return with_validators(response, *validators)
 
     elif request.method == 'PUT':
         serializer = UserProfileSerializer(profile, data=request.data, partial=True)
@@ -61,3 +78,45 @@ def profile_view(request):
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+VARIANT_MAX_AGE = 365 * 24 * 60 * 60
+
+
+@require_safe
+@condition(etag_func=lambda request, name: name.partition('.')[0])
+def profile_image_variant(request, name):
+    """Serve a processed profile image. Its name is a hash of its content, so it can be cached for good."""
+    try:
+        file = default_storage.open(f'{VARIANT_DIR}/{name}')
+    except FileNotFoundError:
+        raise Http404
+    response = FileResponse(file, content_type=CONTENT_TYPES[name.rpartition('.')[2]])
+    response['Cache-Control'] = f'public, max-age={VARIANT_MAX_AGE}, immutable'
+    return response
+
+
+class AvailabilitySlotViewSet(viewsets.ModelViewSet):
+    queryset = AvailabilitySlot.objects.all()
+    serializer_class = AvailabilitySlotSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        return super().get_queryset().filter(mentor=self.request.user.userprofile)
+
+    def perform_create(self, serializer):
+        serializer.save(mentor=self.request.user.userprofile)
+
+
+class AvailabilityExceptionViewSet(viewsets.ModelViewSet):
+    queryset = AvailabilityException.objects.all()
+    serializer_class = AvailabilityExceptionSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        return super().get_queryset().filter(mentor=self.request.user.userprofile)
+
+    def perform_create(self, serializer):
+        serializer.save(mentor=self.request.user.userprofile)
@@ -0,0 +1,133 @@
+import os
+import subprocess
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.serializers import ProfileTokenObtainPairSerializer
+from learning_sessions.models import LearningSession
+from skills.models import Skill
+from .bench_endpoints import acting_profile, percentile
+
+START_SCRIPT = Path(__file__).resolve().parents[3] / 'start.sh'
+STARTUP_TIMEOUT = 30
+# name -> (sync path, async path), formatted with the ids picked for the acting user.
+ENDPOINTS = {
+    'skills': ('/api/skills/', '/api/async/skills/'),
+    'skill-detail': ('/api/skills/{skill}/', '/api/async/skills/{skill}/'),
+    'sessions': ('/api/sessions/', '/api/async/sessions/'),
+    'session-messages': ('/api/sessions/{session}/messages/', '/api/async/sessions/{session}/messages/'),
+    'reviews-for-user': ('/api/reviews/for_user/?user_id={profile}', '/api/async/reviews/for_user/?user_id={profile}'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the sync endpoints on gunicorn WSGI workers with the /api/async/ endpoints '
+        'on gunicorn uvicorn workers, at the same worker count and concurrency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username to act as (default: the mentor with the most sessions).')
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes for both servers.')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight at once.')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and server.')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                            help=f'Comma-separated subset of: {", ".join(ENDPOINTS)}.')
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = set(names) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+        profile = acting_profile(options['user'])
+        token = str(ProfileTokenObtainPairSerializer.get_token(profile.user).access_token)
+        ids = {
+            'profile': profile.pk,
+            'skill': Skill.objects.order_by('-created_at').values_list('id', flat=True).first(),
+            'session': LearningSession.objects.filter(mentor=profile).order_by('-created_at')
+            .values_list('id', flat=True).first(),
+        }
+        self.stdout.write(
+            f'Acting as {profile.user.username}; {options["workers"]} workers, '
+            f'{options["concurrency"]} concurrent, {options["requests"]} requests per endpoint'
+        )
+
+        results = {}
+        for server, paths in (('wsgi', 0), ('asgi', 1)):
+            with self.server(server, options['workers'], options['port']):
+                for name in names:
+                    path = ENDPOINTS[name][paths].format(**ids)
+                    url = f'http://127.0.0.1:{options["port"]}{path}'
+                    results[name, server] = self.load(url, token, options['concurrency'], options['requests'])
+
+        self.stdout.write(f'{"endpoint":<18} {"server":<5} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"errors":>6}')
+        for name in names:
+            for server in ('wsgi', 'asgi'):
+                result = results[name, server]
+                self.stdout.write(
+                    f'{name:<18} {server:<5} {result["rps"]:>8.1f} {result["p50_ms"]:>8.1f} '
+                    f'{result["p95_ms"]:>8.1f} {result["errors"]:>6}'
+                )
+            wsgi, asgi = results[name, 'wsgi']['rps'], results[name, 'asgi']['rps']
+            if wsgi:
+                self.stdout.write(f'{"":<18} asgi/wsgi throughput: {asgi / wsgi:.2f}x')
+
+    @contextmanager
+    def server(self, profile, workers, port):
+        process = subprocess.Popen(
+            ['sh', str(START_SCRIPT), '--workers', str(workers), '--bind', f'127.0.0.1:{port}'],
+            cwd=START_SCRIPT.parent, env={**os.environ, 'SERVER_PROFILE': profile},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            self.wait_until_up(process, port)
+            yield
+        finally:
+            process.terminate()
+            process.wait()
+
+    def wait_until_up(self, process, port):
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server exited with status {process.returncode}; run start.sh by hand to see why.')
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1)
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server did not answer on port {port} within {STARTUP_TIMEOUT}s')
+
+    def load(self, url, token, concurrency, requests):
+        def fetch(_):
+            request = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+                ok = True
+            except OSError:
+                ok = False
+            return time.perf_counter() - start, ok
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            # One untimed round so lazy imports and caches do not count.
+            list(pool.map(fetch, range(concurrency)))
+            start = time.perf_counter()
+            samples = list(pool.map(fetch, range(requests)))
+            elapsed = time.perf_counter() - start
+
+        timings = [duration * 1000 for duration, ok in samples if ok]
+        return {
+            'rps': len(timings) / elapsed,
+            'p50_ms': percentile(timings, 50) if timings else 0.0,
+            'p95_ms': percentile(timings, 95) if timings else 0.0,
+            'errors': len(samples) - len(timings),
+        }
@@ -0,0 +1,180 @@
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from accounts.serializers import ProfileTokenObtainPairSerializer
+from skillswap_backend.urls import router
+
+BUDGETS_PATH = Path(__file__).resolve().parents[2] / 'budgets.json'
+# Extra query parameters some endpoints need to do real work.
+QUERY_PARAMS = {
+    'review-for-user': lambda profile: {'user_id': profile.pk},
+}
+# Read endpoints outside the router.
+EXTRA_ENDPOINTS = ('profile', 'my-summary', 'mentor-leaderboard')
+LATENCY_HEADROOM = 2.0
+# Sub-millisecond jitter should not fail a run, so latency budgets never go below this.
+LATENCY_FLOOR_MS = 50.0
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def acting_profile(username):
+    """``username``'s profile, or by default the mentor with the most sessions."""
+    profiles = UserProfile.objects.select_related('user')
+    if username:
+        profile = profiles.filter(user__username=username).first()
+    else:
+        profile = profiles.filter(user_type='MENTOR').annotate(
+            sessions=Count('teaching_sessions')
+        ).order_by('-sessions', 'pk').first()
+    if profile is None:
+        raise CommandError('No user to act as; run seed_load first or pass --user.')
+    return profile
+
+
+def router_endpoints():
+    """``(name, basename, detail)`` for every GET route the router generates: list, detail and GET extra actions."""
+    for prefix, viewset, basename in router.registry:
+        yield f'{basename}-list', basename, False
+        yield f'{basename}-detail', basename, True
+        for action in viewset.get_extra_actions():
+            if 'get' in action.mapping:
+                yield f'{basename}-{action.url_name}', basename, action.detail
+
+
+class Command(BaseCommand):
+    help = 'Time every router GET endpoint through the test client and compare against stored budgets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username to act as (default: the mentor with the most sessions).')
+        parser.add_argument('--requests', type=int, default=20, help='Timed requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint first.')
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Keep the response cache between requests instead of clearing it each time.')
+        parser.add_argument('--budgets', default=str(BUDGETS_PATH))
+        parser.add_argument('--write-budgets', action='store_true',
+                            help=f'Store these results as the budgets (p95 x{LATENCY_HEADROOM:g}, exact query counts).')
+        parser.add_argument('--output', help='Also write the raw results to this JSON file.')
+
+    def handle(self, *args, **options):
+        profile = acting_profile(options['user'])
+        client = APIClient()
+        # A real access token, so every request pays for the same authentication as in production.
+        token = ProfileTokenObtainPairSerializer.get_token(profile.user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.stdout.write(f'Acting as {profile.user.username} ({profile.user_type})')
+
+        results = {}
+        # name -> why it could not be measured
+        errors = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            # Detail routes reuse the first id their list returned.
+            first_ids = {}
+            for name, basename, detail in [*router_endpoints(), *((name, None, False) for name in EXTRA_ENDPOINTS)]:
+                if detail and first_ids.get(basename) is None:
+                    errors[name] = 'skipped, the list is empty'
+                    self.stdout.write(self.style.WARNING(f'{name}: {errors[name]}'))
+                    continue
+                url = reverse(name, kwargs={'pk': first_ids[basename]} if detail else None)
+                params = QUERY_PARAMS[name](profile) if name in QUERY_PARAMS else {}
+                result, first_id = self.measure(client, url, params, options)
+                if 'status' in result:
+                    errors[name] = f'{url} returned {result["status"]}'
+                    self.stdout.write(self.style.ERROR(f'{name}: {errors[name]}'))
+                    continue
+                results[name] = result
+                if name == f'{basename}-list':
+                    first_ids[basename] = first_id
+                self.stdout.write(
+                    f'{name}: p50 {result["p50_ms"]:.1f} ms, p95 {result["p95_ms"]:.1f} ms, '
+                    f'p99 {result["p99_ms"]:.1f} ms, {result["queries"]} queries'
+                )
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2) + '\n')
+        if options['write_budgets']:
+            failed = {name: error for name, error in errors.items() if not error.startswith('skipped')}
+            if failed:
+                raise CommandError('Not writing budgets while endpoints fail:\n  ' + '\n  '.join(
+                    f'{name}: {error}' for name, error in failed.items()
+                ))
+            self.write_budgets(options['budgets'], results)
+        else:
+            self.check_budgets(options['budgets'], results, errors)
+
+    def measure(self, client, url, params, options):
+        timings = []
+        queries = 0
+        response = None
+        for i in range(options['warmup'] + options['requests']):
+            if not options['warm_cache']:
+                cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get(url, params)
+                elapsed = time.perf_counter() - start
+            if response.status_code != 200:
+                return {'url': url, 'status': response.status_code}, None
+            if i >= options['warmup']:
+                timings.append(elapsed * 1000)
+                queries = max(queries, len(captured.captured_queries))
+
+        data = response.data
+        items = data.get('results') if isinstance(data, dict) else data
+        first_id = items[0].get('id') if isinstance(items, list) and items and isinstance(items[0], dict) else None
+        return {
+            'url': url,
+            'p50_ms': percentile(timings, 50),
+            'p95_ms': percentile(timings, 95),
+            'p99_ms': percentile(timings, 99),
+            'queries': queries,
+        }, first_id
+
+    def write_budgets(self, path, results):
+        budgets = {
+            name: {
+                'p95_ms': round(max(result['p95_ms'] * LATENCY_HEADROOM, LATENCY_FLOOR_MS), 1),
+                'queries': result['queries'],
+            }
+            for name, result in sorted(results.items())
+        }
+        Path(path).write_text(json.dumps(budgets, indent=2) + '\n')
+        self.stdout.write(self.style.SUCCESS(f'Wrote budgets for {len(budgets)} endpoints to {path}'))
+
+    def check_budgets(self, path, results, errors):
+        try:
+            budgets = json.loads(Path(path).read_text())
+        except FileNotFoundError:
+            raise CommandError(f'No budgets at {path}; run with --write-budgets first.')
+
+        # Endpoints outside the budgets still fail the run if they error.
+        failures = [
+            f'{name}: {error}' for name, error in errors.items()
+            if name not in budgets and not error.startswith('skipped')
+        ]
+        for name, budget in budgets.items():
+            result = results.get(name)
+            if result is None:
+                failures.append(f'{name}: {errors.get(name, "not measured")}')
+                continue
+            if result['queries'] > budget['queries']:
+                failures.append(f'{name}: {result["queries"]} queries (budget {budget["queries"]})')
+            if result['p95_ms'] > budget['p95_ms']:
+                failures.append(f'{name}: p95 {result["p95_ms"]:.1f} ms (budget {budget["p95_ms"]} ms)')
+        if failures:
+            raise CommandError('Over budget or failing:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS(f'All {len(results)} endpoints within budget'))
@@ -0,0 +1,61 @@
+import statistics
+from io import BytesIO
+from itertools import islice, cycle
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from learning_sessions.models import LearningSession
+from learning_sessions.serializers import LearningSessionSerializer
+from skillswap_backend.renderers import ORJSONParser, ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        'Time ORJSONRenderer and ORJSONParser against DRF\'s JSONRenderer and JSONParser on a page of sessions. '
+        'Output compatibility is covered by skillswap_backend.tests.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=1000, help='Sessions in the payload.')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed runs per renderer and parser.')
+
+    def handle(self, *args, **options):
+        payload = self.session_payload(options['sessions'])
+        body = JSONRenderer().render(payload)
+        self.stdout.write(f'{options["sessions"]} sessions, {len(body) / 1024:.0f} KiB, median of {options["repeat"]} runs:')
+        for label, baseline, candidate in (
+            ('render', lambda: JSONRenderer().render(payload), lambda: ORJSONRenderer().render(payload)),
+            ('parse', lambda: JSONParser().parse(BytesIO(body)), lambda: ORJSONParser().parse(BytesIO(body))),
+        ):
+            json_ms = self.median_ms(baseline, options['repeat'])
+            orjson_ms = self.median_ms(candidate, options['repeat'])
+            self.stdout.write(
+                f'  {label}: json {json_ms:.2f} ms, orjson {orjson_ms:.2f} ms ({json_ms / orjson_ms:.1f}x)'
+            )
+
+    def session_payload(self, count):
+        """A list response of ``count`` sessions, as the sessions endpoint would serialize it."""
+        sessions = list(
+            LearningSession.objects.select_related(
+                'skill__mentor__user', 'skill__category', 'learner__user', 'mentor__user',
+            ).prefetch_related('skill__tags').order_by('-created_at')[:count]
+        )
+        if not sessions:
+            raise CommandError('No sessions to serialize; run seed_load first.')
+        # Repeat what there is if the database holds fewer sessions than asked for.
+        sessions = list(islice(cycle(sessions), count))
+        results = LearningSessionSerializer(sessions, many=True).data
+        return ReturnDict({'next': None, 'previous': None, 'results': results}, serializer=None)
+
+    def median_ms(self, func, repeat):
+        func()
+        samples = []
+        for _ in range(repeat):
+            start = perf_counter()
+            func()
+            samples.append(perf_counter() - start)
+        return statistics.median(samples) * 1000
@@ -0,0 +1,112 @@
+import statistics
+from collections import defaultdict
+from contextlib import ExitStack
+from functools import wraps
+from time import perf_counter
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import base_user
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.backends import TokenBackend
+
+from accounts.models import UserProfile
+from skillswap_backend.instrumentation import RequestMetrics, current_metrics, instrument_serializers
+
+BENCH_USERNAME = 'bench-login'
+BENCH_PASSWORD = 'bench-login-password'
+PHASES = ('hashing', 'sql', 'token', 'serialize', 'other')
+
+
+def timing(totals, key, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            totals[key] += perf_counter() - start
+    return wrapper
+
+
+class Command(BaseCommand):
+    help = 'Time the login endpoint and split each request into hashing, SQL, token signing and serialization.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help='Log in as this existing user (default: a throwaway user, rolled back).')
+        parser.add_argument('--password', help='Password for --username.')
+        parser.add_argument('--requests', type=int, default=20, help='Timed logins.')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed logins first.')
+
+    def handle(self, *args, **options):
+        if options['username'] and not options['password']:
+            raise CommandError('--username needs --password.')
+        instrument_serializers()
+
+        # InstrumentationMiddleware would replace the command's current_metrics inside each request.
+        with transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], PERF_INSTRUMENTATION=False, PERF_SLOW_QUERY_MS=0,
+        ):
+            if options['username']:
+                credentials = {'username': options['username'], 'password': options['password']}
+            else:
+                user = User.objects.create_user(BENCH_USERNAME, password=BENCH_PASSWORD)
+                UserProfile.objects.create(user=user, user_type='LEARNER')
+                credentials = {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}
+            samples = self.measure(credentials, options['warmup'], options['requests'])
+            transaction.set_rollback(True)
+        self.report(samples)
+
+    def measure(self, credentials, warmup, requests):
+        client = APIClient()
+        url = reverse('token_obtain_pair')
+        samples = []
+        for i in range(warmup + requests):
+            totals = defaultdict(float)
+            metrics = RequestMetrics(None)
+            token = current_metrics.set(metrics)
+            try:
+                with ExitStack() as stack:
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                    stack.enter_context(mock.patch.object(
+                        base_user, 'check_password', timing(totals, 'hashing', base_user.check_password),
+                    ))
+                    stack.enter_context(mock.patch.object(
+                        TokenBackend, 'encode', timing(totals, 'token', TokenBackend.encode),
+                    ))
+                    start = perf_counter()
+                    response = client.post(url, credentials, format='json')
+                    total = perf_counter() - start
+            finally:
+                current_metrics.reset(token)
+            if response.status_code != 200:
+                raise CommandError(f'Login failed with {response.status_code}: {response.data}')
+            if i < warmup:
+                continue
+            totals['sql'] = metrics.db_time
+            totals['serialize'] = metrics.serialize_time
+            totals['other'] = total - sum(totals[phase] for phase in PHASES if phase != 'other')
+            samples.append({'total': total, 'queries': metrics.queries, **totals})
+        return samples
+
+    def report(self, samples):
+        def median_ms(key):
+            return statistics.median(sample[key] for sample in samples) * 1000
+
+        total = median_ms('total')
+        # Shares of the summed non-hashing time over all logins, so that they add up to 100%.
+        outside = sum(sample['total'] - sample['hashing'] for sample in samples)
+        self.stdout.write(
+            f'{len(samples)} logins: median {total:.1f} ms, {max(s["queries"] for s in samples)} queries, '
+            f'{outside / len(samples) * 1000:.1f} ms mean outside password hashing'
+        )
+        for phase in PHASES:
+            share = ''
+            if phase != 'hashing' and outside > 0:
+                share = f', {sum(sample[phase] for sample in samples) / outside:.0%} of non-hashing time'
+            self.stdout.write(f'  {phase}: median {median_ms(phase):.2f} ms{share}')
@@ -0,0 +1,188 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from learning_sessions.models import LearningSession, SessionMessage
+from reviews.models import Review
+from skills.models import Category, Skill, SkillTag, Tag
+from skills.search import index_skills
+
+MENTOR_SHARE = 0.2
+CATEGORIES = 20
+TAGS = 200
+DURATIONS = (30, 45, 60)
+TIMEZONES = ('UTC', 'Europe/London', 'Europe/Berlin', 'America/New_York', 'America/Los_Angeles', 'Asia/Kolkata')
+LEARNER_REVIEW_RATE = 0.7
+MENTOR_REVIEW_RATE = 0.3
+WORDS = (
+    'python django react sql design testing cloud data guitar piano spanish french cooking drawing '
+    'writing marketing finance yoga chess photography statistics algorithms security mobile'
+).split()
+
+
+def batches(count, size):
+    for start in range(0, count, size):
+        yield start, min(size, count - start)
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate synthetic profiles, skills, sessions, messages and reviews for load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=100_000)
+        parser.add_argument('--skills', type=int, default=500_000)
+        parser.add_argument('--sessions', type=int, default=5_000_000)
+        parser.add_argument('--messages-per-session', type=float, default=2.0,
+                            help='Average chat messages per approved or completed session.')
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Multiply every volume by this, e.g. 0.01 for a quick local run.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for repeatable data.')
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = f'load{int(time.time())}'
+        self.now = timezone.now()
+        profiles = max(int(options['profiles'] * scale), 2)
+        skills = max(int(options['skills'] * scale), 1)
+        sessions = int(options['sessions'] * scale)
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        started = time.monotonic()
+        mentors, learners = self.seed_profiles(profiles)
+        categories, tags = self.seed_categories_and_tags()
+        skill_rows = self.seed_skills(skills, mentors, categories, tags)
+        self.seed_sessions(sessions, skill_rows, learners, options['messages_per_session'])
+
+        # bulk_create skips the signals and save() hooks that keep these in step.
+        call_command('rebuild_rating_aggregates', stdout=self.stdout)
+        for start in range(0, len(skill_rows), self.batch_size):
+            index_skills([pk for pk, _, _ in skill_rows[start:start + self.batch_size]])
+        self.stdout.write(self.style.SUCCESS(f'Seeded {self.prefix} in {time.monotonic() - started:.0f}s'))
+
+    def report(self, label, count):
+        self.stdout.write(f'  {label}: {count}')
+
+    def seed_profiles(self, count):
+        password = make_password('loadtest')
+        mentors, learners = [], []
+        for start, size in batches(count, self.batch_size):
+            with transaction.atomic():
+                users = User.objects.bulk_create(
+                    User(
+                        username=f'{self.prefix}-{i}', email=f'{self.prefix}-{i}@example.com', password=password,
+                        first_name=self.rng.choice(WORDS).title(), last_name=f'User{i}',
+                    )
+                    for i in range(start, start + size)
+                )
+                profiles = UserProfile.objects.bulk_create(
+                    UserProfile(
+                        user=user, user_type='MENTOR' if self.rng.random() < MENTOR_SHARE else 'LEARNER',
+                        timezone=self.rng.choice(TIMEZONES),
+                    )
+                    for user in users
+                )
+            for profile in profiles:
+                (mentors if profile.user_type == 'MENTOR' else learners).append(profile.pk)
+        if not mentors or not learners:
+            raise CommandError('Need at least one mentor and one learner; raise --profiles or --scale.')
+        self.report('profiles', count)
+        return mentors, learners
+
+    def seed_categories_and_tags(self):
+        categories = Category.objects.bulk_create(
+            Category(name=f'{self.prefix} {word.title()}') for word in self.rng.sample(WORDS, min(CATEGORIES, len(WORDS)))
+        )
+        tags = Tag.objects.bulk_create(Tag(name=f'{self.prefix}-{i}', slug=f'{self.prefix}-{i}') for i in range(TAGS))
+        return [category.pk for category in categories], [tag.pk for tag in tags]
+
+    def seed_skills(self, count, mentors, categories, tags):
+        rows = []
+        for start, size in batches(count, self.batch_size):
+            with transaction.atomic():
+                skills = Skill.objects.bulk_create(
+                    Skill(
+                        mentor_id=self.rng.choice(mentors), category_id=self.rng.choice(categories),
+                        title=' '.join(self.rng.sample(WORDS, 3)).title(),
+                        description=' '.join(self.rng.choices(WORDS, k=30)),
+                        level=self.rng.choice(Skill.SKILL_LEVELS)[0], duration_minutes=self.rng.choice(DURATIONS),
+                    )
+                    for _ in range(size)
+                )
+                SkillTag.objects.bulk_create(
+                    SkillTag(skill=skill, tag_id=tag_id)
+                    for skill in skills for tag_id in self.rng.sample(tags, self.rng.randint(1, 3))
+                )
+            rows.extend((skill.pk, skill.mentor_id, skill.duration_minutes) for skill in skills)
+        self.report('skills', count)
+        return rows
+
+    def session_status(self, scheduled):
+        if scheduled < self.now:
+            return self.rng.choices(('COMPLETED', 'CANCELLED', 'REJECTED'), (80, 10, 10))[0]
+        return self.rng.choices(('PENDING', 'APPROVED', 'REJECTED', 'CANCELLED'), (40, 40, 10, 10))[0]
+
+    def seed_sessions(self, count, skills, learners, messages_per_session):
+        # Each mentor's sessions sit in consecutive two-hour slots, so active
+        # bookings never overlap (PostgreSQL enforces that with a constraint).
+        mentor_slots = {}
+        mentor_sessions = max(count // max(len({mentor for _, mentor, _ in skills}), 1), 1)
+        messages = reviews = 0
+        for start, size in batches(count, self.batch_size):
+            with transaction.atomic():
+                sessions = []
+                for _ in range(size):
+                    skill_id, mentor_id, duration = self.rng.choice(skills)
+                    slot = mentor_slots.get(mentor_id, 0)
+                    mentor_slots[mentor_id] = slot + 1
+                    scheduled = self.now + timedelta(hours=2 * (slot - mentor_sessions // 2))
+                    sessions.append(LearningSession(
+                        skill_id=skill_id, learner_id=self.rng.choice(learners), mentor_id=mentor_id,
+                        scheduled_datetime=scheduled, ends_at=scheduled + timedelta(minutes=duration),
+                        status=self.session_status(scheduled),
+                    ))
+                sessions = LearningSession.objects.bulk_create(sessions)
+                messages += self.seed_messages(sessions, messages_per_session)
+                reviews += self.seed_reviews(sessions)
+        self.report('sessions', count)
+        self.report('messages', messages)
+        self.report('reviews', reviews)
+
+    def seed_messages(self, sessions, per_session):
+        talking = [session for session in sessions if session.status in ('APPROVED', 'COMPLETED')]
+        created = SessionMessage.objects.bulk_create(
+            SessionMessage(
+                session=session, sender_id=self.rng.choice((session.learner_id, session.mentor_id)),
+                message=' '.join(self.rng.choices(WORDS, k=self.rng.randint(3, 20))),
+            )
+            for session in talking for _ in range(int(self.rng.expovariate(1 / per_session)) if per_session else 0)
+        )
+        return len(created)
+
+    def seed_reviews(self, sessions):
+        reviews = []
+        for session in sessions:
+            if session.status != 'COMPLETED':
+                continue
+            if self.rng.random() < LEARNER_REVIEW_RATE:
+                reviews.append(Review(
+                    session=session, reviewer_id=session.learner_id, reviewed_id=session.mentor_id,
+                    rating=self.rng.choices((1, 2, 3, 4, 5), (3, 5, 15, 37, 40))[0], comment=self.rng.choice(WORDS),
+                ))
+            if self.rng.random() < MENTOR_REVIEW_RATE:
+                reviews.append(Review(
+                    session=session, reviewer_id=session.mentor_id, reviewed_id=session.learner_id,
+                    rating=self.rng.choices((3, 4, 5), (10, 40, 50))[0], comment=self.rng.choice(WORDS),
+                ))
+        return len(Review.objects.bulk_create(reviews))
@@ -0,0 +1,148 @@
+import random
+import re
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from learning_sessions.models import LearningSession, SessionMessage
+from learning_sessions.scheduling import busy_sessions
+from learning_sessions.tasks import due_reminders
+from reviews.models import MentorRanking, Review
+from skills.models import Category, Skill
+
+PAGE = 20
+ORDERING = ('-created_at', '-id')
+
+SQLITE_FULL_SCAN_RE = re.compile(r'\bSCAN (\w+)(?! USING)(?:\s|$)')
+POSTGRES_SEQ_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+
+
+def first(queryset, field):
+    return queryset.order_by().values_list(field, flat=True).first()
+
+
+def hot_queries():
+    """The query shapes behind the busiest endpoints and tasks, as ``(name, queryset)`` pairs."""
+    learner = first(LearningSession.objects.all(), 'learner_id')
+    mentor = first(LearningSession.objects.all(), 'mentor_id')
+    reviewed = first(Review.objects.all(), 'reviewed_id')
+    category = first(Skill.objects.filter(category__isnull=False), 'category_id')
+    session = first(SessionMessage.objects.all(), 'session_id')
+
+    return [
+        ('sessions as learner', LearningSession.objects.filter(learner_id=learner).order_by(*ORDERING)[:PAGE]),
+        ('sessions as mentor', LearningSession.objects.filter(mentor_id=mentor).order_by(*ORDERING)[:PAGE]),
+        ('due reminders', due_reminders(timezone.now()).order_by('id')),
+        ('booking conflicts', busy_sessions(mentor, timezone.now(), timezone.now() + timedelta(hours=1))),
+        ('reviews for user', Review.objects.filter(reviewed_id=reviewed).order_by(*ORDERING)[:PAGE]),
+        ('skills', Skill.objects.order_by(*ORDERING)[:PAGE]),
+        ('skills by category', Skill.objects.filter(category_id=category).order_by(*ORDERING)[:PAGE]),
+        ('skills by level', Skill.objects.filter(level='BEGINNER').order_by(*ORDERING)[:PAGE]),
+        ('session messages', SessionMessage.objects.filter(session_id=session).order_by(*ORDERING)[:PAGE]),
+        ('leaderboard', MentorRanking.objects.filter(category__isnull=True).order_by('-score', 'mentor')[:PAGE]),
+        ('leaderboard by category', MentorRanking.objects.filter(category_id=category).order_by('-score', 'mentor')[:PAGE]),
+        ('session messages (delta)', SessionMessage.objects.filter(session_id=session, id__gt=0).order_by('id')[:PAGE]),
+    ]
+
+
+def full_scans(plan):
+    if connection.vendor == 'postgresql':
+        return POSTGRES_SEQ_SCAN_RE.findall(plan)
+    if connection.vendor == 'sqlite':
+        return SQLITE_FULL_SCAN_RE.findall(plan)
+    return []
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on the hot query shapes and flag any that fall back to a sequential scan.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Insert this many synthetic sessions (plus related rows) first; they are rolled back afterwards.',
+        )
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not only flagged ones.')
+        parser.add_argument('--fail-on-seq-scan', action='store_true', help='Exit with an error if any query is flagged.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'])
+            self.analyze()
+            flagged = self.explain_all(options['verbose_plans'])
+            transaction.set_rollback(True)
+
+        if flagged and options['fail_on_seq_scan']:
+            raise CommandError(f'Sequential scans in: {", ".join(flagged)}')
+
+    def explain_all(self, verbose):
+        flagged = []
+        for name, queryset in hot_queries():
+            plan = queryset.explain()
+            scans = full_scans(plan)
+            if scans:
+                flagged.append(name)
+                self.stdout.write(self.style.WARNING(f'{name}: sequential scan on {", ".join(sorted(set(scans)))}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{name}: ok'))
+            if scans or verbose:
+                self.stdout.write(f'    {plan}'.replace('\n', '\n    '))
+        return flagged
+
+    def analyze(self):
+        # Fresh statistics so the planner judges the seeded data, not empty tables.
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                for model in (UserProfile, Category, Skill, LearningSession, Review, MentorRanking, SessionMessage):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+            elif connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+
+    def seed(self, count):
+        rng = random.Random(0)
+        now = timezone.now()
+        prefix = f'explain-{now.timestamp():.0f}'
+
+        users = User.objects.bulk_create(
+            User(username=f'{prefix}-{i}', email=f'{prefix}-{i}@example.com', password='!')
+            for i in range(max(count // 10, 2))
+        )
+        profiles = UserProfile.objects.bulk_create(
+            UserProfile(user=user, user_type='MENTOR' if i % 2 else 'LEARNER') for i, user in enumerate(users)
+        )
+        mentors, learners = profiles[1::2], profiles[::2]
+        categories = Category.objects.bulk_create(Category(name=f'{prefix}-{i}') for i in range(10))
+        skills = Skill.objects.bulk_create(
+            Skill(
+                mentor=rng.choice(mentors), category=rng.choice(categories), title=f'Skill {i}', description='',
+                level=rng.choice(Skill.SKILL_LEVELS)[0], duration_minutes=60,
+            )
+            for i in range(max(count // 5, 1))
+        )
+        sessions = []
+        for i in range(count):
+            skill = rng.choice(skills)
+            # One-hour sessions an hour apart never trip the mentor overlap constraint.
+            scheduled = now + timedelta(hours=i - count // 2)
+            sessions.append(LearningSession(
+                skill=skill, learner=rng.choice(learners), mentor=skill.mentor,
+                scheduled_datetime=scheduled, ends_at=scheduled + timedelta(minutes=skill.duration_minutes),
+                status=rng.choice(LearningSession.STATUS_CHOICES)[0],
+            ))
+        sessions = LearningSession.objects.bulk_create(sessions)
+        Review.objects.bulk_create(
+            Review(session=session, reviewer=session.learner, reviewed=session.mentor, rating=rng.randint(1, 5), comment='')
+            for session in sessions if session.status == 'COMPLETED'
+        )
+        # bulk_create skips Review.save(), so the leaderboard is rebuilt in one go.
+        MentorRanking.objects.rebuild()
+        SessionMessage.objects.bulk_create(
+            SessionMessage(session=session, sender=session.learner, message='')
+            for session in rng.sample(sessions, min(len(sessions), max(count // 20, 1)))
+            for _ in range(20)
+        )
+        self.stdout.write(f'Seeded {count} sessions (rolled back when done)')
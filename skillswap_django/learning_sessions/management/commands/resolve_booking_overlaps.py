@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from learning_sessions.models import ACTIVE_STATUSES, LearningSession
+from learning_sessions.scheduling import overlapping_bookings
+from learning_sessions.summary import invalidate_summaries
+
+BATCH = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        'List pending and approved sessions that overlap another active session of the same mentor. '
+        'With --cancel, cancel them, keeping approved and then earlier bookings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cancel', action='store_true', help='Cancel the listed sessions.')
+
+    def handle(self, *args, **options):
+        conflicts = overlapping_bookings()
+        if not conflicts:
+            self.stdout.write('No overlapping bookings')
+            return
+        for pk, kept in conflicts:
+            self.stdout.write(f'Session {pk} overlaps session {kept}')
+        if not options['cancel']:
+            self.stdout.write(f'{len(conflicts)} sessions overlap; rerun with --cancel to cancel them')
+            return
+
+        ids = [pk for pk, _ in conflicts]
+        cancelled, profiles = 0, set()
+        with transaction.atomic():
+            for i in range(0, len(ids), BATCH):
+                batch = LearningSession.objects.filter(id__in=ids[i:i + BATCH], status__in=ACTIVE_STATUSES)
+                profiles.update(profile for pair in batch.values_list('learner_id', 'mentor_id') for profile in pair)
+                cancelled += batch.update(status='CANCELLED', updated_at=timezone.now())
+        # The UPDATEs skip save() and its signals, so do their work here.
+        invalidate_summaries(*profiles)
+        self.stdout.write(self.style.SUCCESS(f'Cancelled {cancelled} sessions'))
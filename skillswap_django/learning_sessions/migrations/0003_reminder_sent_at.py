@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_sessions', '0002_sessionmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningsession',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='learningsession',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True), ('status', 'APPROVED')), fields=['scheduled_datetime'], name='session_reminder_due_idx'),
+        ),
+    ]
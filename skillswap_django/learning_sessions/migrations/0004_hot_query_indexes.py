@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_rating_sum'),
+        ('learning_sessions', '0003_reminder_sent_at'),
+        ('skills', '0004_tag_skilltag'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='learningsession',
+            name='learner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='learning_sessions', to='accounts.userprofile'),
+        ),
+        migrations.AlterField(
+            model_name='learningsession',
+            name='mentor',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='teaching_sessions', to='accounts.userprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='learningsession',
+            index=models.Index(fields=['learner', '-created_at', '-id'], name='session_learner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learningsession',
+            index=models.Index(fields=['mentor', '-created_at', '-id'], name='session_mentor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sessionmessage',
+            index=models.Index(fields=['session', 'created_at', 'id'], name='message_session_created_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:20
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def fill_ends_at(apps, schema_editor):
+    LearningSession = apps.get_model('learning_sessions', 'LearningSession')
+    sessions = LearningSession.objects.select_related('skill').only(
+        'scheduled_datetime', 'skill__duration_minutes'
+    )
+    batch = []
+    for session in sessions.iterator(chunk_size=2000):
+        session.ends_at = session.scheduled_datetime + timedelta(minutes=session.skill.duration_minutes)
+        batch.append(session)
+        if len(batch) == 2000:
+            LearningSession.objects.bulk_update(batch, ['ends_at'])
+            batch = []
+    LearningSession.objects.bulk_update(batch, ['ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_availability'),
+        ('learning_sessions', '0004_hot_query_indexes'),
+        ('skills', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningsession',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_ends_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='learningsession',
+            name='ends_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='learningsession',
+            index=models.Index(condition=models.Q(('status__in', ('PENDING', 'APPROVED'))), fields=['mentor', 'ends_at'], name='session_mentor_active_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:20
+
+from django.db import migrations
+
+# Overlapping pairs of active bookings; the exclusion constraint cannot be added while any exist.
+OVERLAPS_SQL = (
+    'SELECT a.id, b.id FROM learning_sessions_learningsession a '
+    'JOIN learning_sessions_learningsession b ON b.mentor_id = a.mentor_id AND b.id > a.id '
+    'AND b.scheduled_datetime < a.ends_at AND a.scheduled_datetime < b.ends_at '
+    "WHERE a.status IN ('PENDING', 'APPROVED') AND b.status IN ('PENDING', 'APPROVED') "
+    'ORDER BY a.id, b.id LIMIT 50'
+)
+
+
+def create_overlap_constraint(apps, schema_editor):
+    # Other databases rely on the locked check in learning_sessions.scheduling.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(OVERLAPS_SQL)
+        overlaps = cursor.fetchall()
+    if overlaps:
+        raise RuntimeError(
+            'Cannot add session_mentor_no_overlap: these active bookings overlap: '
+            + ', '.join(f'{a} and {b}' for a, b in overlaps)
+            + '. Resolve them (see `python manage.py resolve_booking_overlaps`) and migrate again.'
+        )
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(
+        'ALTER TABLE learning_sessions_learningsession ADD CONSTRAINT session_mentor_no_overlap '
+        "EXCLUDE USING gist (mentor_id WITH =, tstzrange(scheduled_datetime, ends_at, '[)') WITH &&) "
+        "WHERE (status IN ('PENDING', 'APPROVED'))"
+    )
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'ALTER TABLE learning_sessions_learningsession DROP CONSTRAINT IF EXISTS session_mentor_no_overlap'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_sessions', '0005_session_ends_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_overlap_constraint, drop_overlap_constraint),
+    ]
@@ -1,8 +1,13 @@
+from datetime import timedelta
+
 from django.db import models
 from django.contrib.auth.models import User
 from accounts.models import UserProfile
 from skills.models import Skill
 
+# Sessions in these states hold the mentor's time.
+ACTIVE_STATUSES = ('PENDING', 'APPROVED')
+
 
 class LearningSession(models.Model):
     STATUS_CHOICES = (
@@ -14,18 +19,64 @@ class LearningSession(models.Model):
     )
     
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
-    learner = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='learning_sessions')
-    mentor = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='teaching_sessions')
+    # Both covered by the (learner|mentor, -created_at) indexes below.
+    learner = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='learning_sessions', db_index=False)
+    mentor = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='teaching_sessions', db_index=False)
     scheduled_datetime = models.DateTimeField()
+    # scheduled_datetime plus the skill's duration, set by save() when the session is created or moved.
+    ends_at = models.DateTimeField(editable=False)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
     learner_message = models.TextField(blank=True, help_text="Message from learner to mentor")
     mentor_response = models.TextField(blank=True, help_text="Response from mentor")
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['learner', '-created_at', '-id'], name='session_learner_created_idx'),
+            models.Index(fields=['mentor', '-created_at', '-id'], name='session_mentor_created_idx'),
+            # Active bookings by end time: the overlap check for a new interval is a range scan from its start.
+            models.Index(
+                fields=['mentor', 'ends_at'],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='session_mentor_active_idx',
+            ),
+            # Only approved sessions still waiting for their reminder, for the reconciliation sweep.
+            models.Index(
+                fields=['scheduled_datetime'],
+                condition=models.Q(status='APPROVED', reminder_sent_at__isnull=True),
+                name='session_reminder_due_idx',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.skill.title} - {self.learner.user.username} with {self.mentor.user.username}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_scheduled_datetime = instance.__dict__.get('scheduled_datetime')
+        return instance
+
+    def schedule_changed(self):
+        if self._state.adding:
+            return True
+        if 'scheduled_datetime' in self.get_deferred_fields():
+            return False
+        return self.scheduled_datetime != getattr(self, '_loaded_scheduled_datetime', None) or self.ends_at is None
+
+    def save(self, *args, **kwargs):
+        # Only a new or moved booking takes the skill's current duration; later edits to the
+        # skill must not shift existing bookings when, say, their status changes.
+        if self.schedule_changed():
+            self.ends_at = self.scheduled_datetime + timedelta(minutes=self.skill.duration_minutes)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'scheduled_datetime' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'ends_at'}
+        super().save(*args, **kwargs)
+        self._loaded_scheduled_datetime = self.scheduled_datetime
+
 
 class SessionMessage(models.Model):
     session = models.ForeignKey(LearningSession, on_delete=models.CASCADE, related_name='messages')
@@ -35,6 +86,9 @@ class SessionMessage(models.Model):
     
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['session', 'created_at', 'id'], name='message_session_created_idx'),
+        ]
     
     def __str__(self):
         return f"Message from {self.sender.user.username} in session {self.session.id}"
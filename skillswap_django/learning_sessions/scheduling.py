@@ -0,0 +1,182 @@
+"""Mentor availability and booking conflicts.
+
+A mentor's open time is their weekly ``AvailabilitySlot`` rows, expanded in
+their profile timezone, plus ``AvailabilityException`` rows marked available,
+minus the ones marked unavailable. Mentors without weekly slots are treated as
+always available. Active sessions (pending or approved) hold
+``[scheduled_datetime, ends_at)``.
+
+Intervals are kept as sorted lists of ``(start, end)`` pairs, so merging and
+subtracting them is a single linear pass. On PostgreSQL the
+``session_mentor_no_overlap`` exclusion constraint also rejects overlapping
+bookings at the database level. The checks here report a readable error first,
+and on other databases they are the only guard. Bookings made before the
+constraint existed may still overlap; ``overlapping_bookings`` finds them for
+the ``resolve_booking_overlaps`` command.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import groupby
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+
+from accounts.models import UserProfile
+from .models import ACTIVE_STATUSES, LearningSession
+
+EXCLUSION_CONSTRAINT = 'session_mentor_no_overlap'
+CONFLICT_MESSAGE = 'The mentor already has a session at that time.'
+UNAVAILABLE_MESSAGE = 'The mentor is not available at that time.'
+
+
+def merge(intervals):
+    """Merge start-sorted intervals that overlap or touch."""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(intervals, removed):
+    """Remove merged ``removed`` intervals from merged ``intervals``, walking both lists once."""
+    result = []
+    i = 0
+    for start, end in intervals:
+        while i < len(removed) and removed[i][1] <= start:
+            i += 1
+        cursor = start
+        j = i
+        while j < len(removed) and removed[j][0] < end:
+            if removed[j][0] > cursor:
+                result.append((cursor, removed[j][0]))
+            cursor = max(cursor, removed[j][1])
+            j += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def clip(intervals, start, end):
+    return [(max(s, start), min(e, end)) for s, e in intervals if s < end and e > start]
+
+
+def mentor_timezone(mentor):
+    try:
+        return ZoneInfo(mentor.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return dt_timezone.utc
+
+
+def weekly_windows(mentor, start, end):
+    """Expand the mentor's weekly slots over ``[start, end)``; None if they have no slots."""
+    slots = defaultdict(list)
+    for slot in mentor.availability_slots.all():
+        slots[slot.weekday].append(slot)
+    if not slots:
+        return None
+
+    tz = mentor_timezone(mentor)
+    day = start.astimezone(tz).date() - timedelta(days=1)
+    last_day = end.astimezone(tz).date()
+    windows = []
+    while day <= last_day:
+        for slot in slots[day.weekday()]:
+            windows.append((
+                datetime.combine(day, slot.start_time, tzinfo=tz).astimezone(dt_timezone.utc),
+                datetime.combine(day, slot.end_time, tzinfo=tz).astimezone(dt_timezone.utc),
+            ))
+        day += timedelta(days=1)
+    return merge(sorted(clip(windows, start, end)))
+
+
+def availability_windows(mentor, start, end):
+    """The mentor's open hours within ``[start, end)``, ignoring existing bookings."""
+    windows = weekly_windows(mentor, start, end)
+    if windows is None:
+        windows = [(start, end)]
+
+    added, blocked = [], []
+    for exception in mentor.availability_exceptions.filter(end__gt=start, start__lt=end):
+        (added if exception.is_available else blocked).append((exception.start, exception.end))
+    if added:
+        windows = merge(sorted(windows + clip(added, start, end)))
+    return subtract(windows, merge(sorted(blocked)))
+
+
+def busy_sessions(mentor_id, start, end):
+    """Active bookings overlapping ``[start, end)``, sorted by start."""
+    return LearningSession.objects.filter(
+        mentor_id=mentor_id, status__in=ACTIVE_STATUSES, ends_at__gt=start, scheduled_datetime__lt=end,
+    ).order_by('scheduled_datetime')
+
+
+def busy_intervals(mentor_id, start, end, exclude_id=None):
+    sessions = busy_sessions(mentor_id, start, end)
+    if exclude_id is not None:
+        sessions = sessions.exclude(pk=exclude_id)
+    return list(sessions.values_list('scheduled_datetime', 'ends_at'))
+
+
+def free_slots(mentor, start, end, min_duration=None):
+    """Open, unbooked intervals for ``mentor`` within ``[start, end)``."""
+    slots = subtract(availability_windows(mentor, start, end), merge(busy_intervals(mentor.id, start, end)))
+    if min_duration:
+        slots = [(s, e) for s, e in slots if e - s >= min_duration]
+    return slots
+
+
+def check_booking(session):
+    """Raise ``ValidationError`` unless the session's time is free for its mentor."""
+    start = session.scheduled_datetime
+    end = start + timedelta(minutes=session.skill.duration_minutes)
+    if busy_intervals(session.mentor_id, start, end, exclude_id=session.pk):
+        raise ValidationError({'scheduled_datetime': [CONFLICT_MESSAGE]})
+    if availability_windows(session.mentor, start, end) != [(start, end)]:
+        raise ValidationError({'scheduled_datetime': [UNAVAILABLE_MESSAGE]})
+
+
+def save_booking(session):
+    """Check and save a new or moved session, one booking per mentor at a time."""
+    with transaction.atomic():
+        # Serialize bookings for this mentor so two requests cannot both pass the check.
+        list(UserProfile.objects.select_for_update().filter(pk=session.mentor_id).values_list('pk'))
+        check_booking(session)
+        try:
+            with transaction.atomic():
+                session.save()
+        except IntegrityError as e:
+            if EXCLUSION_CONSTRAINT not in str(e):
+                raise
+            raise ValidationError({'scheduled_datetime': [CONFLICT_MESSAGE]})
+    return session
+
+
+def overlapping_bookings():
+    """Active bookings that overlap another of the same mentor, as ``(session_id, kept_session_id)``.
+
+    Per mentor, approved bookings are kept before pending ones, then
+    earlier-created before later-created; a booking is listed if it overlaps
+    one already kept.
+    """
+    rows = LearningSession.objects.filter(status__in=ACTIVE_STATUSES).order_by('mentor_id').values_list(
+        'mentor_id', 'id', 'status', 'created_at', 'scheduled_datetime', 'ends_at',
+    )
+    conflicts = []
+    for _, bookings in groupby(rows.iterator(chunk_size=2000), key=lambda row: row[0]):
+        bookings = sorted(bookings, key=lambda row: (row[2] != 'APPROVED', row[3], row[1]))
+        kept = []  # non-overlapping (start, end, id), sorted
+        for _, pk, _, _, start, end in bookings:
+            i = bisect_left(kept, (start, end))
+            if i > 0 and kept[i - 1][1] > start:
+                conflicts.append((pk, kept[i - 1][2]))
+            elif i < len(kept) and kept[i][0] < end:
+                conflicts.append((pk, kept[i][2]))
+            else:
+                kept.insert(i, (start, end, pk))
+    return conflicts
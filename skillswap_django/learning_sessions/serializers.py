@@ -1,12 +1,14 @@
 from rest_framework import serializers
 from .models import LearningSession, SessionMessage
-from accounts.serializers import UserProfileSerializer
+from .scheduling import save_booking
+from accounts.serializers import ProfileSummarySerializer, UserProfileSerializer
+from skillswap_backend.fieldsets import SparseFieldsMixin
 from skills.serializers import SkillSerializer
 
 
-class LearningSessionSerializer(serializers.ModelSerializer):
-    learner = UserProfileSerializer(read_only=True)
-    mentor = UserProfileSerializer(read_only=True)
+class LearningSessionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    learner = ProfileSummarySerializer(read_only=True)
+    mentor = ProfileSummarySerializer(read_only=True)
     skill = SkillSerializer(read_only=True)
     skill_id = serializers.IntegerField(write_only=True)
     skill_title = serializers.CharField(source='skill.title', read_only=True)
@@ -16,22 +18,47 @@ class LearningSessionSerializer(serializers.ModelSerializer):
         fields = ['id', 'skill', 'skill_id', 'skill_title', 'learner', 'mentor', 'scheduled_datetime', 
                  'status', 'learner_message', 'mentor_response', 'created_at', 'updated_at']
         read_only_fields = ['learner', 'mentor']
+    expandable_fields = {'learner': UserProfileSerializer, 'mentor': UserProfileSerializer}
 
     def create(self, validated_data):
         from skills.models import Skill
         skill_id = validated_data.pop('skill_id')
-        skill = Skill.objects.get(id=skill_id)
+        skill = Skill.objects.select_related('mentor').get(id=skill_id)
         validated_data['skill'] = skill
         validated_data['learner'] = self.context['request'].user.userprofile
         validated_data['mentor'] = skill.mentor
-        return super().create(validated_data)
+        return save_booking(LearningSession(**validated_data))
 
 
-class SessionMessageSerializer(serializers.ModelSerializer):
-    sender = UserProfileSerializer(read_only=True)
+class BulkTransitionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=500)
+    status = serializers.ChoiceField(choices=['APPROVED', 'REJECTED', 'COMPLETED'])
+    mentor_response = serializers.CharField(required=False, allow_blank=True)
+
+
+class UpcomingSessionSerializer(serializers.ModelSerializer):
+    skill_title = serializers.CharField(source='skill.title', read_only=True)
+    role = serializers.SerializerMethodField()
+    with_profile = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LearningSession
+        fields = ['id', 'skill_title', 'scheduled_datetime', 'ends_at', 'role', 'with_profile']
+
+    def get_role(self, obj):
+        return 'mentor' if obj.mentor_id == self.context['profile'].pk else 'learner'
+
+    def get_with_profile(self, obj):
+        other = obj.learner if obj.mentor_id == self.context['profile'].pk else obj.mentor
+        return ProfileSummarySerializer(other).data
+
+
+class SessionMessageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    sender = ProfileSummarySerializer(read_only=True)
     sender_name = serializers.CharField(source='sender.user.get_full_name', read_only=True)
 
     class Meta:
         model = SessionMessage
         fields = ['id', 'session', 'sender', 'sender_name', 'message', 'created_at']
         read_only_fields = ['id', 'sender', 'created_at']
+    expandable_fields = {'sender': UserProfileSerializer}
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LearningSession
+from .summary import invalidate_summaries
+
+
+@receiver([post_save, post_delete], sender=LearningSession)
+def invalidate_session_summaries(sender, instance, **kwargs):
+    invalidate_summaries(instance.learner_id, instance.mentor_id)
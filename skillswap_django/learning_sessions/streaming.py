@@ -0,0 +1,154 @@
+"""Push delivery of new session messages.
+
+When a message is posted it is serialized once and published to a per-session
+channel. Every open ``stream`` connection for that session is subscribed to the
+channel and forwards the payload as a Server-Sent Event, so connected clients
+never have to poll or re-fetch the history.
+
+``RedisMessageBroker`` fans messages out across processes through Redis
+pub/sub. ``InMemoryMessageBroker`` keeps everything inside one process and is
+meant for tests and single-worker development. The broker is chosen with the
+``CHAT_MESSAGE_BROKER`` setting.
+
+Streams only work when the app is served through ASGI; WSGI workers would hold
+each connection open forever without flushing it. Browsers cannot set headers
+on an EventSource, so they connect with a short-lived ticket scoped to one user
+and session rather than their access token, which would end up in access logs.
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core import signing
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+
+STREAM_TICKET_SALT = 'learning_sessions.stream-ticket'
+
+
+def channel_name(session_id):
+    return f'session-messages:{session_id}'
+
+
+def issue_stream_ticket(user_id, session_id):
+    return signing.dumps({'user': user_id, 'session': session_id}, salt=STREAM_TICKET_SALT, compress=True)
+
+
+def read_stream_ticket(ticket, session_id):
+    """The user id ``ticket`` was issued to, or None if it is invalid, expired or for another session."""
+    try:
+        claims = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=settings.CHAT_STREAM_TICKET_SECONDS)
+    except signing.BadSignature:
+        return None
+    if claims.get('session') != session_id:
+        return None
+    return claims.get('user')
+
+
+class InMemoryMessageBroker:
+    def __init__(self, **options):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, payload):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, payload)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscription = InMemorySubscription()
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscription)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class InMemorySubscription:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    async def receive(self, timeout):
+        """Return the next payload, or None if nothing arrives within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RedisMessageBroker:
+    def __init__(self, url=None, **options):
+        self.url = url or settings.CELERY_BROKER_URL
+        self._client = None
+
+    def publish(self, channel, payload):
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(channel, payload)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        try:
+            yield RedisSubscription(pubsub)
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+class RedisSubscription:
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    async def receive(self, timeout):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return message['data'].decode()
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        config = settings.CHAT_MESSAGE_BROKER
+        _broker = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+    return _broker
+
+
+def publish_message(session_id, data):
+    """Publish serialized ``SessionMessageSerializer`` data to the session's subscribers."""
+    try:
+        get_broker().publish(channel_name(session_id), render_message(data))
+    except Exception:
+        # Streaming is best-effort: the message is stored and clients catch up on reconnect.
+        logger.exception('Could not publish message for session %s', session_id)
+
+
+def render_message(data):
+    # The API's JSON renderer, so streamed messages match what the messages endpoint returns.
+    return api_settings.DEFAULT_RENDERER_CLASSES[0]().render(data).decode()
+
+
+def format_event(message_id, payload):
+    return f'id: {message_id}\nevent: message\ndata: {payload}\n\n'
@@ -0,0 +1,94 @@
+"""The dashboard summary behind ``/api/me/summary/``.
+
+Counts come from conditional aggregates (``COUNT(...) FILTER (WHERE ...)``), so
+every status/role pair is a single pass over the user's sessions. The result is
+cached per user under a ``summary:<profile id>`` namespace that session, review
+and skill writes invalidate for the profiles involved.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from reviews.models import Review
+from skills.models import Skill
+from skillswap_backend.cache import invalidate, versioned_key
+from .models import LearningSession
+from .serializers import UpcomingSessionSerializer
+
+SUMMARY_TIMEOUT = 300
+STATUSES = [value for value, _ in LearningSession.STATUS_CHOICES]
+ROLES = ('learner', 'mentor')
+
+
+def summary_namespace(profile_id):
+    return f'summary:{profile_id}'
+
+
+def invalidate_summaries(*profile_ids):
+    invalidate(*(summary_namespace(profile_id) for profile_id in set(profile_ids) if profile_id))
+
+
+def session_counts(profile):
+    reviewed = Review.objects.filter(session=OuterRef('pk'), reviewer=profile)
+    aggregates = {
+        f'{role}:{status}': Count('id', filter=Q(**{role: profile}, status=status))
+        for role in ROLES for status in STATUSES
+    }
+    aggregates['unreviewed'] = Count('id', filter=Q(status='COMPLETED') & ~Q(Exists(reviewed)))
+    counts = LearningSession.objects.filter(Q(learner=profile) | Q(mentor=profile)).aggregate(**aggregates)
+
+    sessions = {}
+    for role in ROLES:
+        by_status = {status: counts[f'{role}:{status}'] for status in STATUSES}
+        sessions[role] = {'total': sum(by_status.values()), **by_status}
+    return sessions, counts['unreviewed']
+
+
+def rating_stats(profile):
+    received = Q(reviewed=profile)
+    aggregates = {str(rating): Count('id', filter=received & Q(rating=rating)) for rating in range(1, 6)}
+    counts = Review.objects.filter(received | Q(reviewer=profile)).aggregate(
+        given=Count('id', filter=Q(reviewer=profile)), **aggregates,
+    )
+    given = counts.pop('given')
+    count = sum(counts.values())
+    return {
+        'average': sum(int(rating) * n for rating, n in counts.items()) / count if count else 0.0,
+        'count': count,
+        'given': given,
+        'distribution': counts,
+    }
+
+
+def upcoming_sessions(profile, limit):
+    return list(
+        LearningSession.objects.filter(
+            Q(learner=profile) | Q(mentor=profile), status='APPROVED', scheduled_datetime__gte=timezone.now(),
+        ).select_related('skill', 'learner__user', 'mentor__user').order_by('scheduled_datetime', 'id')[:limit]
+    )
+
+
+def build_summary(profile, limit):
+    sessions, unreviewed = session_counts(profile)
+    upcoming = upcoming_sessions(profile, limit)
+    return {
+        'sessions': sessions,
+        'upcoming': UpcomingSessionSerializer(upcoming, many=True, context={'profile': profile}).data,
+        'unreviewed_completed': unreviewed,
+        'skills': Skill.objects.filter(mentor=profile).count() if profile.user_type == 'MENTOR' else 0,
+        'ratings': rating_stats(profile),
+    }, upcoming
+
+
+def get_summary(profile, limit):
+    key = versioned_key('me-summary', [summary_namespace(profile.pk)], profile.pk, limit)
+    data = cache.get(key)
+    if data is None:
+        data, upcoming = build_summary(profile, limit)
+        timeout = SUMMARY_TIMEOUT
+        if upcoming:
+            # Drop the entry once the next session starts, so it leaves the upcoming list on time.
+            starts_in = (upcoming[0].scheduled_datetime - timezone.now()).total_seconds()
+            timeout = max(1, min(timeout, int(starts_in)))
+        cache.set(key, data, timeout)
+    return data
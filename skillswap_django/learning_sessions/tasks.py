@@ -1,10 +1,17 @@
+import logging
+
 from celery import shared_task
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from datetime import timedelta
 from .models import LearningSession
 
+logger = logging.getLogger(__name__)
+
+
 @shared_task
 def send_booking_confirmation_email(session_id):
     """Send booking confirmation email when session is approved"""
@@ -44,17 +51,22 @@ The SkillSwap Team
     except Exception as e:
         return f"Error sending email: {str(e)}"
 
-@shared_task
-def send_session_reminder_email(session_id):
-    """Send reminder email 30 minutes before session"""
-    try:
-        session = LearningSession.objects.get(id=session_id)
-        
-        if session.status != 'APPROVED':
-            return f"Session {session_id} is not approved, skipping reminder"
-        
-        subject = f'Session Reminder: {session.skill.title} in 30 minutes'
-        message = f"""
+
+REMINDER_BATCH_SIZE = 100
+REMINDER_LEAD_TIME = timedelta(minutes=30)
+
+
+def from_email():
+    return settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@skillswap.com'
+
+
+def reminder_sessions():
+    return LearningSession.objects.select_related('skill', 'learner__user', 'mentor__user')
+
+
+def build_reminder_email(session, connection=None):
+    subject = f'Session Reminder: {session.skill.title} in 30 minutes'
+    message = f"""
 Hi {session.learner.user.first_name},
 
 This is a friendly reminder that your learning session starts in 30 minutes.
@@ -70,37 +82,124 @@ Please be ready to start on time. If you need to reschedule or cancel, please co
 Best regards,
 The SkillSwap Team
         """
-        
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@skillswap.com',
-            [session.learner.user.email],
-            fail_silently=False,
-        )
-        
-        return f"Reminder sent to {session.learner.user.email}"
-        
-    except LearningSession.DoesNotExist:
-        return f"Session {session_id} not found"
+    return EmailMessage(subject, message, from_email(), [session.learner.user.email], connection=connection)
+
+
+def pending_reminders(now):
+    """Approved, upcoming sessions that have not been reminded yet."""
+    return LearningSession.objects.filter(
+        status='APPROVED', reminder_sent_at__isnull=True, scheduled_datetime__gt=now,
+    )
+
+
+def due_reminders(now):
+    return pending_reminders(now).filter(scheduled_datetime__lte=now + REMINDER_LEAD_TIME)
+
+
+def claim_reminders(session_ids, scheduled_for=None):
+    """Mark due reminders as sent and return the sessions this call claimed.
+
+    The conditional UPDATE only touches rows whose ``reminder_sent_at`` is still
+    empty, so concurrent ETA tasks and sweeps can never claim the same session
+    twice. Rows are recognised afterwards by the claim timestamp.
+    """
+    now = timezone.now()
+    if scheduled_for is None:
+        due = due_reminders(now)
+    else:
+        # An ETA task queued before a reschedule must not fire for the new time.
+        due = pending_reminders(now).filter(scheduled_datetime=scheduled_for)
+    due = due.filter(id__in=session_ids)
+    if not due.update(reminder_sent_at=now):
+        return now, []
+    return now, list(reminder_sessions().filter(id__in=session_ids, reminder_sent_at=now))
+
+
+def release_reminders(session_ids, claimed_at):
+    """Undo a claim for reminders that could not be sent so the sweep retries them."""
+    LearningSession.objects.filter(id__in=session_ids, reminder_sent_at=claimed_at).update(reminder_sent_at=None)
+
+
+def schedule_session_reminder(session):
+    """Queue the session's reminder for 30 minutes before it starts, once the transaction commits."""
+    if session.status != 'APPROVED' or session.reminder_sent_at is not None:
+        return
+    scheduled_for = session.scheduled_datetime
+    now = timezone.now()
+    if scheduled_for <= now:
+        return
+    eta = max(scheduled_for - REMINDER_LEAD_TIME, now)
+
+    def enqueue():
+        try:
+            send_session_reminder_email.apply_async(
+                (session.id,), {'scheduled_for': scheduled_for.isoformat()}, eta=eta,
+            )
+        except Exception:
+            # The reconciliation sweep picks the reminder up if the broker is unavailable.
+            logger.exception('Could not schedule reminder for session %s', session.id)
+
+    transaction.on_commit(enqueue)
+
+
+@shared_task
+def send_session_reminder_email(session_id, scheduled_for=None):
+    """Send reminder email 30 minutes before session"""
+    if scheduled_for is not None:
+        scheduled_for = parse_datetime(scheduled_for)
+    claimed_at, sessions = claim_reminders([session_id], scheduled_for)
+    if not sessions:
+        return f"Session {session_id} has no reminder due, skipping"
+
+    session = sessions[0]
+    try:
+        build_reminder_email(session).send(fail_silently=False)
     except Exception as e:
+        release_reminders([session_id], claimed_at)
         return f"Error sending reminder: {str(e)}"
+    return f"Reminder sent to {session.learner.user.email}"
+
+
+@shared_task
+def send_session_reminder_batch(session_ids):
+    """Send reminders for a chunk of sessions over a single SMTP connection"""
+    claimed_at, sessions = claim_reminders(session_ids)
+    messages = [(session.id, build_reminder_email(session)) for session in sessions]
+    result = {'sent': [], 'failed': {}, 'skipped': sorted(set(session_ids) - {pk for pk, _ in messages})}
+    if not messages:
+        return result
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        result['failed'] = {str(pk): f"Could not connect: {e}" for pk, _ in messages}
+        release_reminders([pk for pk, _ in messages], claimed_at)
+        return result
+
+    try:
+        # One send_messages() call per message on the already-open connection,
+        # so a rejected recipient fails only its own reminder.
+        for pk, message in messages:
+            try:
+                if connection.send_messages([message]):
+                    result['sent'].append(pk)
+                else:
+                    result['failed'][str(pk)] = 'Not sent'
+            except Exception as e:
+                result['failed'][str(pk)] = str(e)
+    finally:
+        connection.close()
+    release_reminders([int(pk) for pk in result['failed']], claimed_at)
+    return result
+
 
 @shared_task
 def schedule_session_reminders():
-    """Check for sessions starting in 30 minutes and send reminders"""
-    now = timezone.now()
-    reminder_time = now + timedelta(minutes=30)
-    
-    sessions = LearningSession.objects.filter(
-        status='APPROVED',
-        scheduled_datetime__gte=reminder_time - timedelta(minutes=2),
-        scheduled_datetime__lte=reminder_time + timedelta(minutes=2)
-    )
+    """Reconciliation sweep: send reminders that missed their ETA task"""
+    session_ids = list(due_reminders(timezone.now()).order_by('id').values_list('id', flat=True))
     
-    count = 0
-    for session in sessions:
-        send_session_reminder_email.delay(session.id)
-        count += 1
+    for start in range(0, len(session_ids), REMINDER_BATCH_SIZE):
+        send_session_reminder_batch.delay(session_ids[start:start + REMINDER_BATCH_SIZE])
     
-    return f"Scheduled {count} reminder emails"
+    return f"Scheduled {len(session_ids)} reminder emails"
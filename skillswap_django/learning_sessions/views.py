@@ -1,34 +1,148 @@
-from rest_framework import viewsets, permissions, status
-from rest_framework.decorators import action
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from rest_framework import viewsets, permissions, serializers, status
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from django.db import models
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import models, transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from skillswap_backend.async_api import aget_object, apaginate, async_action
+from skillswap_backend.conditional import ConditionalGetMixin, not_modified, with_validators
+from skillswap_backend.fieldsets import SparseQuerysetMixin
+from accounts.authentication import authenticate_async
+from accounts.models import UserProfile
 from .models import LearningSession, SessionMessage
-from .serializers import LearningSessionSerializer, SessionMessageSerializer
+from .scheduling import free_slots, save_booking
+from .serializers import BulkTransitionSerializer, LearningSessionSerializer, SessionMessageSerializer
+from .summary import get_summary, invalidate_summaries
+from .streaming import (
+    channel_name, format_event, get_broker, issue_stream_ticket, publish_message, read_stream_ticket, render_message,
+)
+from .tasks import schedule_session_reminder
+
+MESSAGE_DELTA_LIMIT = 50
+MESSAGE_DELTA_MAX_LIMIT = 200
+FREE_SLOTS_MAX_RANGE = timedelta(days=31)
+# Target status -> statuses a session may move from in a bulk transition.
+BULK_TRANSITIONS = {
+    'APPROVED': ('PENDING',),
+    'REJECTED': ('PENDING',),
+    'COMPLETED': ('APPROVED',),
+}
+SUMMARY_UPCOMING_LIMIT = 5
+SUMMARY_UPCOMING_MAX_LIMIT = 20
+MESSAGE_VERSION = {'latest': models.Max('id'), 'total': models.Count('id')}
+
+
+def message_etag(session_id, version):
+    return quote_etag(f"messages-{session_id}-{version['latest'] or 0}-{version['total']}")
+
+
+def with_message_etag(response, etag):
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
-class LearningSessionViewSet(viewsets.ModelViewSet):
+def message_window(messages, query_params):
+    """The ``?after_id=`` or ``?before_id=`` rows as ``(queryset, limit, scrollback)``, or None if neither is given.
+
+    The queryset reads one row past ``limit`` to tell whether more follow.
+    Raises ValueError for non-integer parameters.
+    """
+    after_id = query_params.get('after_id')
+    before_id = query_params.get('before_id')
+    if not (after_id or before_id):
+        return None
+    limit = max(1, min(int(query_params.get('limit', MESSAGE_DELTA_LIMIT)), MESSAGE_DELTA_MAX_LIMIT))
+    if after_id:
+        return messages.filter(id__gt=int(after_id)).order_by('id')[:limit + 1], limit, False
+    return messages.filter(id__lt=int(before_id)).order_by('-id')[:limit + 1], limit, True
+
+
+class LearningSessionViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = LearningSession.objects.all()
+    # The nested skill's mentor is the session's mentor.
+    version_fields = ('updated_at', 'skill__updated_at', 'learner__updated_at', 'mentor__updated_at')
+    version_namespaces = ('categories',)
+    # The nested skill carries its own mentor, category and tags.
+    select_related_fields = {
+        'skill': ('skill__mentor__user', 'skill__category'),
+        'skill_title': ('skill',),
+        'learner': ('learner__user',),
+        'mentor': ('mentor__user',),
+    }
+    prefetch_related_fields = {'skill': ('skill__tags',)}
     serializer_class = LearningSessionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user_profile = self.request.user.userprofile
-        return LearningSession.objects.filter(
+        return super().get_queryset().filter(
             models.Q(learner=user_profile) | models.Q(mentor=user_profile)
         ).order_by('-created_at')
 
     @action(detail=False, methods=['get'])
     def as_learner(self, request):
-        sessions = LearningSession.objects.filter(learner=request.user.userprofile)
-        serializer = self.get_serializer(sessions, many=True)
-        return Response(serializer.data)
+        sessions = self.get_queryset().filter(learner=request.user.userprofile)
+        page = self.paginate_queryset(sessions)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def as_mentor(self, request):
-        sessions = LearningSession.objects.filter(mentor=request.user.userprofile)
-        serializer = self.get_serializer(sessions, many=True)
-        return Response(serializer.data)
+        sessions = self.get_queryset().filter(mentor=request.user.userprofile)
+        page = self.paginate_queryset(sessions)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='bulk-transition')
+    def bulk_transition(self, request):
+        serializer = BulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        target = serializer.validated_data['status']
+        user_profile = request.user.userprofile
+
+        with transaction.atomic():
+            sessions = LearningSession.objects.select_for_update().filter(
+                models.Q(learner=user_profile) | models.Q(mentor=user_profile), id__in=ids,
+            ).only('id', 'learner_id', 'mentor_id', 'status', 'scheduled_datetime', 'reminder_sent_at').in_bulk()
+
+            results = []
+            for pk in ids:
+                session = sessions.get(pk)
+                if session is None:
+                    error = 'Not found.'
+                elif session.mentor_id != user_profile.pk:
+                    error = 'Only the mentor can change this session.'
+                elif session.status not in BULK_TRANSITIONS[target]:
+                    error = f'Cannot move a {session.status.lower()} session to {target.lower()}.'
+                else:
+                    results.append({'id': pk, 'status': target})
+                    continue
+                results.append({'id': pk, 'error': error})
+
+            updated = [sessions[result['id']] for result in results if 'error' not in result]
+            if updated:
+                changes = {'status': target, 'updated_at': timezone.now()}
+                if 'mentor_response' in serializer.validated_data:
+                    changes['mentor_response'] = serializer.validated_data['mentor_response']
+                # One UPDATE skips save() and its signals, so do their work here.
+                LearningSession.objects.filter(id__in=[session.id for session in updated]).update(**changes)
+                invalidate_summaries(user_profile.pk, *(session.learner_id for session in updated))
+                for session in updated:
+                    session.status = target
+                    schedule_session_reminder(session)
+
+        return Response({'updated': len(updated), 'results': results})
 
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -40,6 +154,7 @@ class LearningSessionViewSet(viewsets.ModelViewSet):
         session.status = 'APPROVED'
         session.mentor_response = request.data.get('mentor_response', '')
         session.save()
+        schedule_session_reminder(session)
         
         # from .tasks import send_booking_confirmation_email
         # send_booking_confirmation_email.delay(session.id)
@@ -75,10 +190,15 @@ class LearningSessionViewSet(viewsets.ModelViewSet):
             return Response({'error': 'scheduled_datetime is required'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        session.scheduled_datetime = new_datetime
+        try:
+            session.scheduled_datetime = serializers.DateTimeField().to_internal_value(new_datetime)
+        except serializers.ValidationError as e:
+            raise serializers.ValidationError({'scheduled_datetime': e.detail})
+        session.reminder_sent_at = None
         if session.status == 'APPROVED':
             session.status = 'PENDING'
-        session.save()
+        save_booking(session)
+        schedule_session_reminder(session)
         
         serializer = self.get_serializer(session)
         return Response(serializer.data)
@@ -93,9 +213,7 @@ class LearningSessionViewSet(viewsets.ModelViewSet):
                           status=status.HTTP_403_FORBIDDEN)
         
         if request.method == 'GET':
-            messages = session.messages.all()
-            serializer = SessionMessageSerializer(messages, many=True)
-            return Response(serializer.data)
+            return self.list_messages(request, session)
         
         elif request.method == 'POST':
             message_text = request.data.get('message')
@@ -109,7 +227,56 @@ class LearningSessionViewSet(viewsets.ModelViewSet):
                 message=message_text
             )
             serializer = SessionMessageSerializer(message)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            data = serializer.data
+            transaction.on_commit(lambda: publish_message(session.id, data))
+            return Response(data, status=status.HTTP_201_CREATED)
+
+    def list_messages(self, request, session):
+        """List a session's messages, answering unchanged polls with 304 before serializing.
+
+        ``?after_id=`` returns only messages newer than that id and ``?before_id=``
+        the ones older than it (scrollback), oldest first and at most ``?limit=``
+        rows. Without either, the history is cursor-paginated newest first.
+        """
+        etag = message_etag(session.id, session.messages.aggregate(**MESSAGE_VERSION))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        messages = session.messages.select_related('sender__user')
+        try:
+            window = message_window(messages, request.query_params)
+        except ValueError:
+            return Response({'error': 'after_id, before_id and limit must be integers'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if window is None:
+            page = self.paginate_queryset(messages)
+            serializer = SessionMessageSerializer(page, many=True, context=self.get_serializer_context())
+            response = self.get_paginated_response(serializer.data)
+        else:
+            rows, limit, scrollback = window
+            response = self.message_window_response(list(rows), limit, scrollback)
+        return with_message_etag(response, etag)
+
+    def message_window_response(self, rows, limit, scrollback):
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if scrollback:
+            rows.reverse()
+        serializer = SessionMessageSerializer(rows, many=True, context=self.get_serializer_context())
+        return Response({'results': serializer.data, 'has_more': has_more})
+
+    @action(detail=True, methods=['post'], url_path='stream-ticket')
+    def stream_ticket(self, request, pk=None):
+        """A short-lived ticket for opening the session's message stream, or 404 if streaming is off."""
+        session = self.get_object()
+        if not settings.CHAT_STREAM_ENABLED:
+            return Response({'detail': 'Live updates are not available; poll messages with ?after_id='},
+                          status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            'ticket': issue_stream_ticket(request.user.id, session.id),
+            'expires_in': settings.CHAT_STREAM_TICKET_SECONDS,
+        })
 
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
@@ -125,3 +292,139 @@ class LearningSessionViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(session)
         return Response(serializer.data)
+
+
+async def message_events(session_id, last_event_id=None):
+    last_id = 0
+    async with get_broker().subscribe(channel_name(session_id)) as subscription:
+        # Subscribed first, so anything posted while replaying is still delivered.
+        if last_event_id and last_event_id.isdigit():
+            last_id = int(last_event_id)
+            missed = SessionMessage.objects.filter(
+                session_id=session_id, id__gt=last_id
+            ).select_related('sender__user').order_by('id')
+            async for message in missed.aiterator():
+                yield format_event(message.id, render_message(SessionMessageSerializer(message).data))
+                last_id = message.id
+
+        yield ': connected\n\n'
+        while True:
+            payload = await subscription.receive(timeout=settings.CHAT_STREAM_HEARTBEAT_SECONDS)
+            if payload is None:
+                yield ': keep-alive\n\n'
+                continue
+            message_id = json.loads(payload)['id']
+            if message_id > last_id:
+                last_id = message_id
+                yield format_event(message_id, payload)
+
+
+async def session_message_stream(request, pk):
+    """Server-Sent Events feed of new messages in a session.
+
+    Authenticates with ``?ticket=`` from ``stream-ticket`` or an Authorization
+    header. Answers 404 unless served through ASGI, so clients fall back to
+    polling ``messages/?after_id=``.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'Live updates are not available; poll messages with ?after_id='},
+                            status=status.HTTP_404_NOT_FOUND)
+    if 'ticket' in request.GET:
+        user_id = read_stream_ticket(request.GET['ticket'], pk)
+    else:
+        user = await authenticate_async(request)
+        user_id = user.id if user is not None else None
+    if user_id is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'},
+                            status=status.HTTP_401_UNAUTHORIZED)
+
+    participants = await LearningSession.objects.filter(pk=pk).values_list(
+        'learner__user_id', 'mentor__user_id'
+    ).afirst()
+    if participants is None:
+        return JsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+    if user_id not in participants:
+        return JsonResponse({'error': 'Only session participants can access messages'},
+                            status=status.HTTP_403_FORBIDDEN)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    response = StreamingHttpResponse(message_events(pk, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@async_action(LearningSessionViewSet, 'list')
+async def session_list_async(view, request):
+    etag = await sync_to_async(view.list_etag)(request)
+    response = not_modified(request, etag)
+    if response is None:
+        response = await apaginate(view, view.filter_queryset(view.get_queryset()))
+    return with_validators(response, etag)
+
+
+@async_action(LearningSessionViewSet, 'messages')
+async def session_messages_async(view, request, pk):
+    """GET counterpart of ``LearningSessionViewSet.messages``, with the same 304 and window handling."""
+    user_profile = request.user.userprofile
+    session = await aget_object(view, LearningSession.objects.filter(
+        models.Q(learner=user_profile) | models.Q(mentor=user_profile)
+    ).only('id'))
+    etag = message_etag(session.id, await session.messages.aaggregate(**MESSAGE_VERSION))
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    messages = session.messages.select_related('sender__user')
+    try:
+        window = message_window(messages, request.query_params)
+    except ValueError:
+        return Response({'error': 'after_id, before_id and limit must be integers'},
+                      status=status.HTTP_400_BAD_REQUEST)
+    if window is None:
+        response = await apaginate(view, messages, SessionMessageSerializer)
+    else:
+        rows, limit, scrollback = window
+        response = view.message_window_response([row async for row in rows.aiterator()], limit, scrollback)
+    return with_message_etag(response, etag)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def mentor_free_slots(request, pk):
+    """Open, unbooked time for a mentor between ``?from=`` and ``?to=``, optionally at least ``?duration=`` minutes long."""
+    mentor = get_object_or_404(
+        UserProfile.objects.prefetch_related('availability_slots'), pk=pk, user_type='MENTOR'
+    )
+    field = serializers.DateTimeField()
+    try:
+        start = field.to_internal_value(request.query_params['from'])
+        end = field.to_internal_value(request.query_params['to'])
+        duration = request.query_params.get('duration')
+        min_duration = timedelta(minutes=int(duration)) if duration else None
+    except (KeyError, ValueError, serializers.ValidationError):
+        return Response({'error': 'from and to must be ISO 8601 datetimes and duration a number of minutes'},
+                      status=status.HTTP_400_BAD_REQUEST)
+    if not start < end <= start + FREE_SLOTS_MAX_RANGE:
+        return Response({'error': f'to must be after from and at most {FREE_SLOTS_MAX_RANGE.days} days later'},
+                      status=status.HTTP_400_BAD_REQUEST)
+
+    slots = free_slots(mentor, start, end, min_duration)
+    return Response({
+        'mentor': mentor.id,
+        'timezone': mentor.timezone,
+        'slots': [{'start': field.to_representation(s), 'end': field.to_representation(e)} for s, e in slots],
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def my_summary(request):
+    """Dashboard counts for the current user plus their next ``?upcoming=`` approved sessions."""
+    try:
+        limit = max(0, min(int(request.query_params.get('upcoming', SUMMARY_UPCOMING_LIMIT)), SUMMARY_UPCOMING_MAX_LIMIT))
+    except ValueError:
+        limit = SUMMARY_UPCOMING_LIMIT
+    response = Response(get_summary(request.user.userprofile, limit))
+    response['Cache-Control'] = 'private, no-cache'
+    return response
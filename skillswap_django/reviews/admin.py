@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Review
+from .models import MentorRanking, Review
 
 
 @admin.register(Review)
@@ -7,3 +7,11 @@ class ReviewAdmin(admin.ModelAdmin):
     list_display = ['session', 'reviewer', 'reviewed', 'rating', 'created_at']
     list_filter = ['rating', 'created_at']
     search_fields = ['reviewer__user__username', 'reviewed__user__username']
+
+
+@admin.register(MentorRanking)
+class MentorRankingAdmin(admin.ModelAdmin):
+    list_display = ['mentor', 'category', 'score', 'review_count']
+    list_filter = ['category']
+    search_fields = ['mentor__user__username']
+    readonly_fields = ['rating_sum', 'review_count', 'score']
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import UserProfile
+from reviews.models import MentorRanking, Review
+
+
+class Command(BaseCommand):
+    help = 'Recompute UserProfile.rating_sum / review_count and the mentor leaderboard from the reviews table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of profiles rewritten per UPDATE statement.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        received = Review.objects.filter(reviewed=OuterRef('pk')).order_by().values('reviewed')
+        rating_sum = Coalesce(
+            Subquery(received.annotate(total=Sum('rating')).values('total')), Value(0),
+            output_field=IntegerField(),
+        )
+        review_count = Coalesce(
+            Subquery(received.annotate(total=Count('id')).values('total')), Value(0),
+            output_field=IntegerField(),
+        )
+
+        last_id = 0
+        updated = 0
+        while True:
+            ids = list(
+                UserProfile.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                updated += UserProfile.objects.filter(pk__gte=ids[0], pk__lte=ids[-1]).update(
+                    rating_sum=rating_sum, review_count=review_count,
+                )
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rating aggregates for {updated} profiles'))
+
+        rankings = MentorRanking.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rankings} mentor ranking rows'))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_rating_sum'),
+        ('learning_sessions', '0004_hot_query_indexes'),
+        ('reviews', '0002_alter_review_session_alter_review_unique_together'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='review',
+            name='reviewed',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews_received', to='accounts.userprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['reviewed', '-created_at', '-id'], name='review_reviewed_created_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+
+# Frozen copies of reviews.models.RANKING_PRIOR_MEAN / RANKING_PRIOR_WEIGHT.
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
+
+def fill_rankings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    MentorRanking = apps.get_model('reviews', 'MentorRanking')
+    totals = {}
+    rows = Review.objects.filter(reviewed=F('session__mentor')).values_list(
+        'reviewed_id', 'session__skill__category_id'
+    ).annotate(rating_sum=Sum('rating'), review_count=Count('id')).order_by()
+    for mentor_id, category_id, rating_sum, review_count in rows:
+        for key in {(mentor_id, None), (mentor_id, category_id)}:
+            total = totals.setdefault(key, [0, 0])
+            total[0] += rating_sum
+            total[1] += review_count
+    MentorRanking.objects.bulk_create(
+        (
+            MentorRanking(
+                mentor_id=mentor_id, category_id=category_id, rating_sum=rating_sum, review_count=review_count,
+                score=(PRIOR_WEIGHT * PRIOR_MEAN + rating_sum) / (PRIOR_WEIGHT + review_count),
+            )
+            for (mentor_id, category_id), (rating_sum, review_count) in totals.items()
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_availability'),
+        ('reviews', '0003_hot_query_indexes'),
+        ('skills', '0006_recommendations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MentorRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('review_count', models.IntegerField(default=0)),
+                ('score', models.FloatField(default=3.0)),
+                ('category', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.category')),
+                ('mentor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='accounts.userprofile')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('category__isnull', True)), fields=['-score', 'mentor'], name='mentor_ranking_overall_idx'), models.Index(condition=models.Q(('category__isnull', False)), fields=['category', '-score', 'mentor'], name='mentor_ranking_category_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('mentor',), name='mentor_ranking_overall_uniq'), models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('mentor', 'category'), name='mentor_ranking_category_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
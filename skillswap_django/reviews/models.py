@@ -1,26 +1,169 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import UserProfile
 from learning_sessions.models import LearningSession
+from skills.models import Category
+
+# Every mentor starts from this many virtual reviews of this rating, so a
+# single 5-star review cannot outrank a long, consistently good record. Keeping
+# the prior fixed means a review only ever changes its own mentor's rows.
+RANKING_PRIOR_MEAN = 3.0
+RANKING_PRIOR_WEIGHT = 5
+
+
+def ranking_score(rating_sum, review_count):
+    """Bayesian average rating, shrunk towards ``RANKING_PRIOR_MEAN``."""
+    return (RANKING_PRIOR_WEIGHT * RANKING_PRIOR_MEAN + rating_sum) / (RANKING_PRIOR_WEIGHT + review_count)
 
 
 class Review(models.Model):
     session = models.ForeignKey(LearningSession, on_delete=models.CASCADE, related_name='reviews')
     reviewer = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='reviews_given')
-    reviewed = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='reviews_received')
+    # Covered by the (reviewed, -created_at) index below.
+    reviewed = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='reviews_received', db_index=False)
     rating = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     comment = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         unique_together = ('session', 'reviewer', 'reviewed')
+        indexes = [
+            models.Index(fields=['reviewed', '-created_at', '-id'], name='review_reviewed_created_idx'),
+        ]
 
     def __str__(self):
         return f"Review by {self.reviewer.user.username} for {self.reviewed.user.username} - {self.rating} stars"
 
+    def lock_stored_rating(self):
+        """Lock this review's row and note its stored ``(reviewed_id, rating)``, or None if it has no row.
+
+        Concurrent edits and deletes of the review then wait for each other, so
+        each applies its rating delta to what the previous one left behind.
+        """
+        stored = Review.objects.select_for_update().filter(pk=self.pk).values_list('reviewed_id', 'rating').first()
+        if stored is not None:
+            self._stored_rating = stored
+        return stored
+
+    def apply_rating(self, reviewed_id, rating_delta, count_delta=0):
+        """Apply this review's effect on the reviewed profile's counters and, for its mentor, the leaderboard."""
+        UserProfile.objects.adjust_rating(reviewed_id, rating_delta, count_delta)
+        if not hasattr(self, '_session_context'):
+            self._session_context = LearningSession.objects.filter(pk=self.session_id).values_list(
+                'mentor_id', 'skill__category_id'
+            ).first()
+        if self._session_context and self._session_context[0] == reviewed_id:
+            MentorRanking.objects.adjust(reviewed_id, self._session_context[1], rating_delta, count_delta)
+
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        reviews = Review.objects.filter(reviewed=self.reviewed)
-        self.reviewed.average_rating = reviews.aggregate(models.Avg('rating'))['rating__avg'] or 0.0
-        self.reviewed.review_count = reviews.count()
-        self.reviewed.save()
+        update_fields = kwargs.get('update_fields')
+        counted = update_fields is None or not {'rating', 'reviewed', 'reviewed_id'}.isdisjoint(update_fields)
+        with transaction.atomic():
+            stored = self.lock_stored_rating() if counted and not self._state.adding else None
+            super().save(*args, **kwargs)
+            if not counted:
+                return
+            if stored is None:
+                self.apply_rating(self.reviewed_id, self.rating, 1)
+            elif stored[0] != self.reviewed_id:
+                self.apply_rating(stored[0], -stored[1], -1)
+                self.apply_rating(self.reviewed_id, self.rating, 1)
+            elif stored[1] != self.rating:
+                self.apply_rating(self.reviewed_id, self.rating - stored[1])
+        self._stored_rating = (self.reviewed_id, self.rating)
+        if Review.reviewed.is_cached(self):
+            self.reviewed.refresh_from_db(fields=UserProfile.COUNTER_FIELDS)
+
+
+class MentorRankingManager(models.Manager):
+    def rebuild(self):
+        """Recompute every ranking row from the reviews table; returns the number of rows written."""
+        totals = {}
+        rows = Review.objects.filter(reviewed=models.F('session__mentor')).values_list(
+            'reviewed_id', 'session__skill__category_id'
+        ).annotate(rating_sum=models.Sum('rating'), review_count=models.Count('id')).order_by()
+        for mentor_id, category_id, rating_sum, review_count in rows:
+            for key in {(mentor_id, None), (mentor_id, category_id)}:
+                total = totals.setdefault(key, [0, 0])
+                total[0] += rating_sum
+                total[1] += review_count
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                (
+                    self.model(
+                        mentor_id=mentor_id, category_id=category_id, rating_sum=rating_sum,
+                        review_count=review_count, score=ranking_score(rating_sum, review_count),
+                    )
+                    for (mentor_id, category_id), (rating_sum, review_count) in totals.items()
+                ),
+                batch_size=2000,
+            )
+        return len(totals)
+
+    def adjust(self, mentor_id, category_id, rating_delta, count_delta=0):
+        """Apply a review's effect on the mentor's overall row and, if the skill has one, category row."""
+        for category in (None, category_id) if category_id else (None,):
+            self._adjust_row(mentor_id, category, rating_delta, count_delta)
+
+    def _adjust_row(self, mentor_id, category_id, rating_delta, count_delta):
+        rows = self.filter(mentor_id=mentor_id, category_id=category_id)
+        # SET expressions read the old column values, so the score applies the deltas itself.
+        changes = {
+            'rating_sum': models.F('rating_sum') + rating_delta,
+            'review_count': models.F('review_count') + count_delta,
+            'score': (
+                models.Value(RANKING_PRIOR_WEIGHT * RANKING_PRIOR_MEAN + rating_delta) + models.F('rating_sum')
+            ) / (
+                models.Value(float(RANKING_PRIOR_WEIGHT + count_delta)) + models.F('review_count')
+            ),
+        }
+        if rows.update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                self.create(
+                    mentor_id=mentor_id, category_id=category_id, rating_sum=rating_delta,
+                    review_count=count_delta, score=ranking_score(rating_delta, count_delta),
+                )
+        except IntegrityError:
+            # Created concurrently by another review of the same mentor.
+            rows.update(**changes)
+
+
+class MentorRanking(models.Model):
+    """Materialized leaderboard: one row per mentor overall (``category`` null) and per category."""
+    mentor = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='rankings')
+    # Covered by the (category, -score) index below.
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, null=True, blank=True, related_name='+', db_index=False
+    )
+    rating_sum = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    score = models.FloatField(default=RANKING_PRIOR_MEAN)
+
+    objects = MentorRankingManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['mentor'], condition=models.Q(category__isnull=True), name='mentor_ranking_overall_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['mentor', 'category'], condition=models.Q(category__isnull=False),
+                name='mentor_ranking_category_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['-score', 'mentor'], condition=models.Q(category__isnull=True), name='mentor_ranking_overall_idx'
+            ),
+            models.Index(
+                fields=['category', '-score', 'mentor'], condition=models.Q(category__isnull=False),
+                name='mentor_ranking_category_idx',
+            ),
+        ]
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.review_count if self.review_count else 0.0
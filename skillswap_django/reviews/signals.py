@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from learning_sessions.summary import invalidate_summaries
+from .models import Review
+
+
+@receiver(pre_delete, sender=Review)
+def lock_review_rating(sender, instance, **kwargs):
+    # Runs inside the delete's transaction, so the rating removed below is the one being deleted.
+    instance.lock_stored_rating()
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_rating(sender, instance, **kwargs):
+    reviewed_id, rating = getattr(instance, '_stored_rating', (instance.reviewed_id, instance.rating))
+    instance.apply_rating(reviewed_id, -rating, -1)
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_review_summaries(sender, instance, **kwargs):
+    # Before save() returns, _stored_rating still names the previously reviewed profile.
+    previous_id = getattr(instance, '_stored_rating', (None,))[0]
+    invalidate_summaries(instance.reviewer_id, instance.reviewed_id, previous_id)
@@ -1,52 +1,41 @@
-from rest_framework import viewsets, permissions, status
+from rest_framework import generics, viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from django.db import models
-from .models import Review
-from .serializers import ReviewSerializer
+from skillswap_backend.async_api import apaginate, async_action
+from skillswap_backend.fieldsets import SparseQuerysetMixin
+from .models import MentorRanking, Review
+from .serializers import MentorRankingSerializer, ReviewSerializer
 
+LEADERBOARD_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 100
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ReviewViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
+    select_related_fields = {
+        'reviewer': ('reviewer__user',),
+        'reviewer_name': ('reviewer__user',),
+        'reviewed': ('reviewed__user',),
+    }
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
+        queryset = super().get_queryset()
         user_profile = self.request.user.userprofile
         user_id = self.request.query_params.get('user_id')
         
         if user_id:
-            return Review.objects.filter(reviewed__id=user_id).order_by('-created_at')
+            return queryset.filter(reviewed__id=user_id).order_by('-created_at')
         
-        return Review.objects.filter(
+        return queryset.filter(
             models.Q(reviewer=user_profile) | models.Q(reviewed=user_profile)
         ).order_by('-created_at')
 
-    def create(self, request, *args, **kwargs):
-        print(f"DEBUG: ReviewViewSet.create called")
-        print(f"DEBUG: request.data: {request.data}")
-        print(f"DEBUG: request.user: {request.user}")
-        print(f"DEBUG: request.user.is_authenticated: {request.user.is_authenticated}")
-        print(f"DEBUG: request.content_type: {request.content_type}")
-        
-        try:
-            return super().create(request, *args, **kwargs)
-        except Exception as e:
-            print(f"DEBUG: Exception in create: {e}")
-            print(f"DEBUG: Exception type: {type(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
-            raise
-
-    def perform_create(self, serializer):
-        print(f"DEBUG: perform_create called with data: {self.request.data}")
-        print(f"DEBUG: user: {self.request.user}")
-        print(f"DEBUG: serializer.validated_data: {serializer.validated_data}")
-        serializer.save()
-    
     def perform_update(self, serializer):
-        review = self.get_object()
+        review = serializer.instance
         if review.reviewer != self.request.user.userprofile:
             raise PermissionDenied("You can only edit your own reviews")
         serializer.save()
@@ -63,6 +52,47 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return Response({'error': 'user_id parameter is required'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        reviews = Review.objects.filter(reviewed__id=user_id).order_by('-created_at')
-        serializer = self.get_serializer(reviews, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(self.reviews_for(user_id))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def reviews_for(self, user_id):
+        return super().get_queryset().filter(reviewed__id=user_id)
+
+
+class LeaderboardView(generics.ListAPIView):
+    serializer_class = MentorRankingSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        category = self.request.query_params.get('category')
+        if category:
+            rankings = MentorRanking.objects.filter(category_id=category)
+        else:
+            rankings = MentorRanking.objects.filter(category__isnull=True)
+        # Ordered to match the ranking indexes, so the top N is a range scan.
+        return rankings.filter(review_count__gt=0).select_related('mentor__user').order_by('-score', 'mentor')
+
+    def get_limit(self):
+        try:
+            return max(1, min(int(self.request.query_params.get('limit', LEADERBOARD_LIMIT)), LEADERBOARD_MAX_LIMIT))
+        except ValueError:
+            return LEADERBOARD_LIMIT
+
+    def list(self, request, *args, **kwargs):
+        category = request.query_params.get('category')
+        if category and not category.isdigit():
+            return Response({'error': 'category must be a category id'}, status=status.HTTP_400_BAD_REQUEST)
+        rankings = list(self.get_queryset()[:self.get_limit()])
+        for rank, ranking in enumerate(rankings, start=1):
+            ranking.rank = rank
+        return Response(self.get_serializer(rankings, many=True).data)
+
+
+@async_action(ReviewViewSet, 'for_user')
+async def reviews_for_user_async(view, request):
+    user_id = request.query_params.get('user_id')
+    if not user_id:
+        return Response({'error': 'user_id parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
+    return await apaginate(view, view.reviews_for(user_id))
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Skill
+from .models import Category, Skill, Tag
 
 
 @admin.register(Category)
@@ -8,6 +8,12 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ['name']
 
 
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug']
+    search_fields = ['name', 'slug']
+
+
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ['title', 'mentor', 'category', 'level', 'duration_minutes', 'created_at']
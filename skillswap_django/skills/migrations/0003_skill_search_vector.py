@@ -0,0 +1,50 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:02
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX skills_skill_search_vector_gin ON skills_skill USING gin (search_vector)'
+        )
+        schema_editor.execute(
+            "UPDATE skills_skill SET search_vector = "
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+        )
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE skills_skill_fts USING fts5(title, description, tags)'
+        )
+        schema_editor.execute(
+            'INSERT INTO skills_skill_fts(rowid, title, description, tags) '
+            'SELECT id, title, description, tags FROM skills_skill'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS skills_skill_search_vector_gin')
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS skills_skill_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0002_skill_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
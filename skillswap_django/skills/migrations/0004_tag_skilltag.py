@@ -0,0 +1,85 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def split_tag_strings(apps, schema_editor):
+    Skill = apps.get_model('skills', 'Skill')
+    Tag = apps.get_model('skills', 'Tag')
+    SkillTag = apps.get_model('skills', 'SkillTag')
+
+    skill_slugs = {}
+    names = {}
+    for skill_id, value in Skill.objects.exclude(tags='').values_list('id', 'tags').iterator():
+        slugs = []
+        for name in value.split(','):
+            name = name.strip()
+            slug = slugify(name)[:50]
+            if slug and slug not in slugs:
+                slugs.append(slug)
+                names.setdefault(slug, name[:50])
+        skill_slugs[skill_id] = slugs
+
+    Tag.objects.bulk_create([Tag(slug=slug, name=name) for slug, name in names.items()], batch_size=1000)
+    tag_ids = dict(Tag.objects.values_list('slug', 'id'))
+    SkillTag.objects.bulk_create(
+        [
+            SkillTag(skill_id=skill_id, tag_id=tag_ids[slug])
+            for skill_id, slugs in skill_slugs.items()
+            for slug in slugs
+        ],
+        batch_size=1000,
+    )
+
+
+def join_tag_strings(apps, schema_editor):
+    Skill = apps.get_model('skills', 'Skill')
+    SkillTag = apps.get_model('skills', 'SkillTag')
+
+    tags = {}
+    for skill_id, name in SkillTag.objects.order_by('id').values_list('skill_id', 'tag__name').iterator():
+        tags.setdefault(skill_id, []).append(name)
+    for skill_id, names in tags.items():
+        Skill.objects.filter(pk=skill_id).update(tags=', '.join(names)[:500])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_skill_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('slug', models.SlugField(unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SkillTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tags', to='skills.skill')),
+                ('tag', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='skill_tags', to='skills.tag')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='skilltag',
+            constraint=models.UniqueConstraint(fields=('tag', 'skill'), name='skills_skilltag_tag_skill_uniq'),
+        ),
+        migrations.RunPython(split_tag_strings, join_tag_strings),
+        migrations.RemoveField(
+            model_name='skill',
+            name='tags',
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='skills', through='skills.SkillTag', to='skills.tag'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_rating_sum'),
+        ('skills', '0004_tag_skilltag'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skill',
+            name='category',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='skills.category'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['-created_at', '-id'], name='skill_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='skill_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['level', '-created_at', '-id'], name='skill_level_created_idx'),
+        ),
+    ]
@@ -1,6 +1,26 @@
-from django.db import models
+from django.db import models, transaction
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import User
+from django.utils.text import slugify
 from accounts.models import UserProfile
+from skillswap_backend.cache import invalidate
+
+
+def normalize_tag(name):
+    return slugify(name.strip())[:50]
+
+
+def parse_tags(value):
+    """Split a comma-separated string (or list) of tag names, dropping blanks and duplicates."""
+    if isinstance(value, str):
+        value = value.split(',')
+    names = {}
+    for name in value:
+        name = name.strip()
+        slug = normalize_tag(name)
+        if slug and slug not in names:
+            names[slug] = name[:50]
+    return names
 
 
 class Category(models.Model):
@@ -15,6 +35,52 @@ class Category(models.Model):
         verbose_name_plural = "Categories"
 
 
+class TagManager(models.Manager):
+    def resolve(self, names):
+        """Return the tags for ``names`` (a slug -> name mapping), creating any that are missing."""
+        if not names:
+            return []
+        existing = {tag.slug: tag for tag in self.filter(slug__in=names)}
+        missing = [Tag(slug=slug, name=name) for slug, name in names.items() if slug not in existing]
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            existing.update((tag.slug, tag) for tag in self.filter(slug__in=[tag.slug for tag in missing]))
+        return [existing[slug] for slug in names]
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+    slug = models.SlugField(max_length=50, unique=True)
+
+    objects = TagManager()
+
+    def __str__(self):
+        return self.name
+
+
+class SkillManager(models.Manager):
+    def bulk_create_with_tags(self, skills, tag_names):
+        """Insert ``skills`` and their tags (a list of tag-name lists, one per skill) in a handful of queries."""
+        skills = self.bulk_create(skills)
+        all_names = {}
+        for names in tag_names:
+            all_names.update(parse_tags(names))
+        tags = {tag.slug: tag.id for tag in Tag.objects.resolve(all_names)}
+        SkillTag.objects.bulk_create(
+            [
+                SkillTag(skill=skill, tag_id=tags[slug])
+                for skill, names in zip(skills, tag_names) for slug in parse_tags(names)
+            ],
+            ignore_conflicts=True,
+        )
+
+        # bulk_create skips save() and its signals.
+        from .search import index_skills
+        index_skills([skill.pk for skill in skills])
+        invalidate('skills')
+        return skills
+
+
 class Skill(models.Model):
     SKILL_LEVELS = (
         ('BEGINNER', 'Beginner'),
@@ -23,14 +89,91 @@ class Skill(models.Model):
     )
     
     mentor = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='skills_offered')
-    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True)
+    # Covered by the (category, -created_at) index below.
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, db_index=False)
     title = models.CharField(max_length=200)
     description = models.TextField()
     level = models.CharField(max_length=15, choices=SKILL_LEVELS, default='BEGINNER')
     duration_minutes = models.IntegerField(help_text="Typical session duration in minutes")
-    tags = models.CharField(max_length=500, blank=True, help_text="Comma-separated tags")
+    tags = models.ManyToManyField(Tag, through='SkillTag', related_name='skills', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = SkillManager()
+
+    class Meta:
+        # Listings are filtered by category or level and paginated on (-created_at, -id).
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='skill_created_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='skill_category_created_idx'),
+            models.Index(fields=['level', '-created_at', '-id'], name='skill_level_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.mentor.user.username}"
+
+    def save_with_tags(self, tags, **kwargs):
+        """Save the skill and replace its tags, indexing it for search once, after both are written."""
+        with transaction.atomic():
+            # The post_save handler would index the skill before its new tags exist.
+            self._index_after_tags = True
+            try:
+                self.save(**kwargs)
+            finally:
+                del self._index_after_tags
+            self.set_tags(tags)
+
+    def set_tags(self, value):
+        tags = Tag.objects.resolve(parse_tags(value))
+        tag_ids = [tag.id for tag in tags]
+        SkillTag.objects.filter(skill=self).exclude(tag_id__in=tag_ids).delete()
+        SkillTag.objects.bulk_create(
+            [SkillTag(skill=self, tag_id=tag_id) for tag_id in tag_ids], ignore_conflicts=True
+        )
+
+        from .search import index_skills
+        index_skills([self.pk])
+        invalidate('skills')
+
+
+class SkillTag(models.Model):
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='skill_tags')
+    # Covered by the (tag, skill) unique index, which doubles as the tag -> skills lookup.
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='skill_tags', db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'skill'], name='skills_skilltag_tag_skill_uniq'),
+        ]
+
+
+class SkillCooccurrence(models.Model):
+    """How many learners booked both ``skill`` and ``other``; the ``skill == other`` row counts the skill's learners."""
+    # Covered by the (skill, other) unique index.
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='cooccurrences', db_index=False)
+    other = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'other'], name='skills_cooccurrence_pair_uniq'),
+        ]
+
+
+class SkillNeighbors(models.Model):
+    """Precomputed "learners also booked" skills for one skill, best first, as ``[skill_id, score]`` pairs."""
+    skill = models.OneToOneField(Skill, on_delete=models.CASCADE, primary_key=True, related_name='neighbors')
+    neighbors = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class RecommendationBuild(models.Model):
+    """One run of the co-occurrence build; the latest row's ``last_session_id`` is where the next one resumes."""
+    last_session_id = models.BigIntegerField(default=0)
+    full = models.BooleanField(default=False)
+    sessions_processed = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        get_latest_by = 'id'
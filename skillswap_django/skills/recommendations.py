@@ -0,0 +1,176 @@
+"""Skill-to-skill "learners also booked" recommendations.
+
+Bookings form a binary learner x skill incidence matrix ``A`` and ``A.T @ A`` is
+the skill co-occurrence matrix, whose diagonal is each skill's learner count.
+The counts live in ``SkillCooccurrence`` and are maintained incrementally: only
+learners with sessions newer than the last build are re-multiplied, and the
+difference between their new and old products is added on. Every skill whose
+counts changed gets its top-k neighbors, scored by cosine similarity
+``C[i, j] / sqrt(C[i, i] * C[j, j])``, rewritten into ``SkillNeighbors`` so a
+request only reads one row.
+
+Incremental builds do not re-score skills whose only change is a neighbor's
+learner count, and never see deleted or late-committed sessions; the periodic
+full build resets all of that.
+"""
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+from scipy import sparse
+
+from learning_sessions.models import LearningSession
+from .models import RecommendationBuild, SkillCooccurrence, SkillNeighbors
+
+TOP_K = 20
+BATCH_SIZE = 500
+
+
+def batches(values, size=BATCH_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def pair_array(rows):
+    return np.array(list(rows), dtype=np.int64).reshape(-1, 2)
+
+
+def incidence(pairs, learner_ids, skill_ids):
+    rows = np.searchsorted(learner_ids, pairs[:, 0])
+    cols = np.searchsorted(skill_ids, pairs[:, 1])
+    data = np.ones(len(pairs), dtype=np.int64)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(learner_ids), len(skill_ids)))
+
+
+def cooccurrence_delta(old_pairs, new_pairs):
+    """Co-occurrence counts added by ``new_pairs`` on top of ``old_pairs``, as ``(skill, other, count)`` arrays.
+
+    Both are ``(learner_id, skill_id)`` arrays covering the same learners.
+    """
+    old_pairs = np.unique(old_pairs, axis=0)
+    all_pairs = np.unique(np.vstack([old_pairs, new_pairs]), axis=0)
+    learner_ids = np.unique(all_pairs[:, 0])
+    skill_ids = np.unique(all_pairs[:, 1])
+
+    after = incidence(all_pairs, learner_ids, skill_ids)
+    before = incidence(old_pairs, learner_ids, skill_ids)
+    delta = (after.T @ after - before.T @ before).tocoo()
+    delta.eliminate_zeros()
+    return skill_ids[delta.row], skill_ids[delta.col], delta.data
+
+
+def apply_counts(skills, others, counts):
+    increments = defaultdict(dict)
+    for skill_id, other_id, count in zip(skills.tolist(), others.tolist(), counts.tolist()):
+        increments[skill_id][other_id] = count
+
+    for chunk in batches(sorted(increments)):
+        existing = {
+            (row.skill_id, row.other_id): row
+            for row in SkillCooccurrence.objects.filter(skill_id__in=chunk)
+        }
+        changed, created = [], []
+        for skill_id in chunk:
+            for other_id, count in increments[skill_id].items():
+                row = existing.get((skill_id, other_id))
+                if row is None:
+                    created.append(SkillCooccurrence(skill_id=skill_id, other_id=other_id, count=count))
+                else:
+                    row.count += count
+                    changed.append(row)
+        SkillCooccurrence.objects.bulk_update(changed, ['count'], batch_size=BATCH_SIZE)
+        SkillCooccurrence.objects.bulk_create(created, batch_size=BATCH_SIZE)
+    return sorted(increments)
+
+
+def top_neighbors(skills, others, counts, diagonal, top_k):
+    """Rank each skill's co-occurring skills by cosine similarity and keep the best ``top_k``."""
+    keep = skills != others
+    skills, others, counts = skills[keep], others[keep], counts[keep]
+    scores = counts / np.sqrt(diagonal(skills) * diagonal(others))
+
+    order = np.lexsort((others, -scores, skills))
+    skills, others, scores = skills[order], others[order], scores[order]
+    starts = np.flatnonzero(np.r_[True, skills[1:] != skills[:-1]]) if len(skills) else np.array([], dtype=np.int64)
+    rank = np.arange(len(skills)) - np.repeat(starts, np.diff(np.r_[starts, len(skills)]))
+    keep = rank < top_k
+
+    neighbors = defaultdict(list)
+    for skill_id, other_id, score in zip(skills[keep].tolist(), others[keep].tolist(), scores[keep].tolist()):
+        neighbors[skill_id].append([other_id, round(score, 4)])
+    return neighbors
+
+
+def refresh_neighbors(skill_ids, top_k):
+    diagonal_rows = np.array(
+        list(SkillCooccurrence.objects.filter(other=F('skill')).values_list('skill_id', 'count')), dtype=np.int64,
+    ).reshape(-1, 2)
+    diagonal_rows = diagonal_rows[np.argsort(diagonal_rows[:, 0])]
+
+    def diagonal(ids):
+        return diagonal_rows[np.searchsorted(diagonal_rows[:, 0], ids), 1].astype(np.float64)
+
+    for chunk in batches(skill_ids):
+        rows = np.array(
+            list(SkillCooccurrence.objects.filter(skill_id__in=chunk).values_list('skill_id', 'other_id', 'count')),
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        neighbors = top_neighbors(rows[:, 0], rows[:, 1], rows[:, 2], diagonal, top_k)
+        SkillNeighbors.objects.bulk_create(
+            [SkillNeighbors(skill_id=skill_id, neighbors=neighbors.get(skill_id, [])) for skill_id in chunk],
+            update_conflicts=True, unique_fields=['skill'], update_fields=['neighbors', 'updated_at'],
+        )
+
+
+def build_recommendations(full=False, top_k=TOP_K):
+    """Fold sessions created since the last build into the co-occurrence counts and refresh affected neighbors.
+
+    Returns the new ``RecommendationBuild``, or None if there was nothing to do.
+    """
+    previous = None if full else RecommendationBuild.objects.order_by('-id').first()
+    since = previous.last_session_id if previous else 0
+
+    sessions = LearningSession.objects.order_by()
+    new = np.array(
+        list(sessions.filter(id__gt=since).values_list('id', 'learner_id', 'skill_id')), dtype=np.int64,
+    ).reshape(-1, 3)
+    if not len(new) and not full:
+        return None
+
+    old = pair_array(())
+    if since:
+        learners = sessions.filter(id__gt=since).values('learner_id')
+        old = pair_array(
+            sessions.filter(id__lte=since, learner_id__in=learners).values_list('learner_id', 'skill_id').distinct()
+        )
+
+    with transaction.atomic():
+        if full:
+            SkillCooccurrence.objects.all().delete()
+            SkillNeighbors.objects.all().delete()
+        touched = []
+        if len(new):
+            touched = apply_counts(*cooccurrence_delta(old, new[:, 1:]))
+            refresh_neighbors(touched, top_k)
+        return RecommendationBuild.objects.create(
+            last_session_id=int(new[:, 0].max()) if len(new) else since,
+            full=full,
+            sessions_processed=len(new),
+        )
+
+
+def related_skill_ids(skill_id, limit):
+    neighbors = SkillNeighbors.objects.filter(skill_id=skill_id).values_list('neighbors', flat=True).first()
+    return [other_id for other_id, _ in (neighbors or [])[:limit]]
+
+
+def recommended_skill_ids(profile, limit):
+    """Skills most related to everything ``profile`` has booked, excluding those."""
+    booked = set(LearningSession.objects.filter(learner=profile).values_list('skill_id', flat=True))
+    scores = defaultdict(float)
+    for neighbors in SkillNeighbors.objects.filter(skill_id__in=booked).values_list('neighbors', flat=True):
+        for other_id, score in neighbors:
+            if other_id not in booked:
+                scores[other_id] += score
+    return sorted(scores, key=lambda other_id: (-scores[other_id], other_id))[:limit]
@@ -0,0 +1,112 @@
+"""Full-text search over skills.
+
+PostgreSQL keeps a weighted tsvector in ``Skill.search_vector`` backed by a GIN
+index. SQLite mirrors the searchable text into an FTS5 table keyed by the skill
+id. Any other backend falls back to ``icontains`` filtering.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'skills_skill_fts'
+SEARCH_CONFIG = 'english'
+
+# Relative weights for title, description and tags in the SQLite bm25 ranking,
+# mirroring the A/C/B tsvector weights used on PostgreSQL.
+FTS_WEIGHTS = (10.0, 1.0, 5.0)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_vector(title, description, tags):
+    return (
+        SearchVector(Value(title), weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Value(tags), weight='B', config=SEARCH_CONFIG)
+        + SearchVector(Value(description), weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def skill_documents(skill_ids):
+    """Return ``(id, title, description, tags)`` rows with tag names joined into one string."""
+    from .models import Skill, SkillTag
+
+    tags = {}
+    for skill_id, name in SkillTag.objects.filter(skill_id__in=skill_ids).values_list('skill_id', 'tag__name'):
+        tags.setdefault(skill_id, []).append(name)
+    return [
+        (pk, title, description, ' '.join(tags.get(pk, ())))
+        for pk, title, description in Skill.objects.filter(pk__in=skill_ids).values_list('id', 'title', 'description')
+    ]
+
+
+def index_skills(skill_ids):
+    """Refresh the search index for the given skill ids."""
+    from .models import Skill
+
+    skill_ids = list(skill_ids)
+    if not skill_ids or connection.vendor not in ('postgresql', 'sqlite'):
+        return
+
+    documents = skill_documents(skill_ids)
+    if connection.vendor == 'postgresql':
+        for pk, title, description, tags in documents:
+            Skill.objects.filter(pk=pk).update(search_vector=search_vector(title, description, tags))
+    else:
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in skill_ids])
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE}(rowid, title, description, tags) VALUES (%s, %s, %s, %s)',
+                documents,
+            )
+
+
+def unindex_skill(skill_id):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [skill_id])
+
+
+def fts5_query(text):
+    """Turn free text into an FTS5 query of quoted terms, prefix-matching the last one."""
+    tokens = TOKEN_RE.findall(text)
+    if not tokens:
+        return ''
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_skills(queryset, text):
+    """Filter ``queryset`` to skills matching ``text``, annotated with a ``rank`` (higher is better)."""
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        )
+
+    if connection.vendor == 'sqlite':
+        match = fts5_query(text)
+        if not match:
+            return queryset.annotate(rank=Value(0.0, output_field=FloatField())).none()
+        table = queryset.model._meta.db_table
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(
+            rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    from .models import SkillTag
+
+    tagged = SkillTag.objects.filter(tag__name__icontains=text).values('skill_id')
+    return queryset.filter(
+        Q(title__icontains=text) | Q(description__icontains=text) | Q(id__in=tagged)
+    ).annotate(rank=Value(0.0, output_field=FloatField()))
@@ -1,24 +1,70 @@
 from rest_framework import serializers
-from .models import Category, Skill
-from accounts.serializers import UserProfileSerializer
+from .models import Category, Skill, Tag, parse_tags
+from accounts.serializers import ProfileSummarySerializer, UserProfileSerializer
+from skillswap_backend.fieldsets import SparseFieldsMixin
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'description', 'icon']
 
 
-class SkillSerializer(serializers.ModelSerializer):
-    mentor = UserProfileSerializer(read_only=True)
+class TagSerializer(serializers.ModelSerializer):
+    skill_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Tag
+        fields = ['id', 'name', 'slug', 'skill_count']
+
+
+class TagListField(serializers.Field):
+    """Tags as the comma-separated string clients have always sent and received."""
+
+    def to_representation(self, value):
+        return ', '.join(tag.name for tag in value.all())
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (str, list)):
+            raise serializers.ValidationError('Expected a comma-separated string or a list of tags.')
+        return list(parse_tags(data).values())
+
+
+class SkillSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    mentor = ProfileSummarySerializer(read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
+    tags = TagListField(required=False)
     
     class Meta:
         model = Skill
         fields = ['id', 'mentor', 'category', 'category_name', 'title', 'description', 
                  'level', 'duration_minutes', 'tags', 'created_at', 'updated_at']
         read_only_fields = ['mentor']
+    expandable_fields = {'mentor': UserProfileSerializer}
 
+    # Skill and tags are written through save_with_tags, so the skill is indexed for search only once.
     def create(self, validated_data):
+        tags = validated_data.pop('tags', [])
         validated_data['mentor'] = self.context['request'].user.userprofile
-        return super().create(validated_data)
+        skill = Skill(**validated_data)
+        skill.save_with_tags(tags)
+        return skill
+
+    def update(self, instance, validated_data):
+        tags = validated_data.pop('tags', None)
+        if tags is None:
+            return super().update(instance, validated_data)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save_with_tags(tags)
+        return instance
+
+
+class SkillBulkItemSerializer(serializers.ModelSerializer):
+    """One skill in ``POST /api/skills/bulk/``; categories are checked for the whole batch in the view."""
+    category = serializers.IntegerField(required=False, allow_null=True)
+    tags = TagListField(required=False)
+
+    class Meta:
+        model = Skill
+        fields = ['category', 'title', 'description', 'level', 'duration_minutes', 'tags']
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from learning_sessions.summary import invalidate_summaries
+from skillswap_backend.cache import invalidate
+from .models import Category, Skill, Tag
+from .search import index_skills, unindex_skill
+
+
+@receiver(post_save, sender=Skill)
+def update_skill_search_index(sender, instance, **kwargs):
+    if not getattr(instance, '_index_after_tags', False):
+        index_skills([instance.pk])
+
+
+@receiver(post_delete, sender=Skill)
+def remove_skill_search_index(sender, instance, **kwargs):
+    unindex_skill(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Skill)
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_skills(sender, **kwargs):
+    invalidate('skills')
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_categories(sender, **kwargs):
+    invalidate('categories')
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_mentor_summary(sender, instance, **kwargs):
+    invalidate_summaries(instance.mentor_id)
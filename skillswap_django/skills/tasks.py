@@ -0,0 +1,22 @@
+from celery import shared_task
+from django.core.cache import cache
+from .recommendations import build_recommendations
+
+BUILD_LOCK_KEY = 'recommendations:build-lock'
+BUILD_LOCK_TIMEOUT = 60 * 60
+
+
+@shared_task
+def rebuild_skill_recommendations(full=False):
+    """Fold new sessions into the skill co-occurrence counts and refresh related skills"""
+    # Two overlapping incremental builds would count the same sessions twice.
+    if not cache.add(BUILD_LOCK_KEY, 1, BUILD_LOCK_TIMEOUT):
+        return "Recommendation build already running, skipping"
+    try:
+        build = build_recommendations(full=full)
+    finally:
+        cache.delete(BUILD_LOCK_KEY)
+
+    if build is None:
+        return "No sessions to process"
+    return f"Processed {build.sessions_processed} sessions up to session {build.last_session_id}"
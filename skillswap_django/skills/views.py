@@ -1,34 +1,98 @@
-from rest_framework import viewsets, permissions
+from asgiref.sync import sync_to_async
+from rest_framework import viewsets, permissions, status
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
-from .models import Category, Skill
-from .serializers import CategorySerializer, SkillSerializer
+from skillswap_backend.async_api import aget_object, apaginate, async_action
+from skillswap_backend.cache import CachedListMixin
+from skillswap_backend.conditional import ConditionalGetMixin, not_modified, version_etag, with_validators
+from skillswap_backend.fieldsets import SparseQuerysetMixin
+from skillswap_backend.pagination import SearchRankCursorPagination, TagCursorPagination
+from learning_sessions.summary import invalidate_summaries
+from .models import Category, Skill, SkillTag, Tag, normalize_tag
+from .recommendations import TOP_K, recommended_skill_ids, related_skill_ids
+from .search import search_skills
+from .serializers import CategorySerializer, SkillBulkItemSerializer, SkillSerializer, TagSerializer
 
+BULK_MAX_ITEMS = 500
 
-class CategoryViewSet(viewsets.ModelViewSet):
+
+class CategoryViewSet(CachedListMixin, viewsets.ModelViewSet):
+    cache_dependencies = ('categories',)
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+
+class TagViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Tag.objects.all()
+    serializer_class = TagSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TagCursorPagination
+
+    def get_queryset(self):
+        return Tag.objects.annotate(skill_count=Count('skill_tags'))
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ConditionalGetMixin, CachedListMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    # The list embeds category names and mentor profiles, so it depends on those too.
+    cache_dependencies = ('skills', 'categories', 'profiles')
+    version_fields = ('updated_at', 'mentor__updated_at')
+    version_namespaces = ('categories',)
     queryset = Skill.objects.all()
+    select_related_fields = {'mentor': ('mentor__user',), 'category_name': ('category',)}
+    prefetch_related_fields = {'tags': ('tags',)}
     serializer_class = SkillSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Skill.objects.all()
+        queryset = super().get_queryset()
         category = self.request.query_params.get('category', None)
         level = self.request.query_params.get('level', None)
+        tag = self.request.query_params.get('tag', None)
+        tags_all = self.request.query_params.get('tags_all', None)
         
         if category:
             queryset = queryset.filter(category_id=category)
         if level:
             queryset = queryset.filter(level=level)
+        if tag:
+            queryset = queryset.filter(
+                id__in=SkillTag.objects.filter(tag__slug=normalize_tag(tag)).values('skill_id')
+            )
+        if tags_all:
+            slugs = {normalize_tag(name) for name in tags_all.split(',')} - {''}
+            if slugs:
+                queryset = queryset.filter(
+                    id__in=SkillTag.objects.filter(tag__slug__in=slugs)
+                    .values('skill_id')
+                    .annotate(matched=Count('tag_id'))
+                    .filter(matched=len(slugs))
+                    .values('skill_id')
+                )
+
+        if self.is_search():
+            return search_skills(queryset, self.request.query_params['q'].strip())
             
         return queryset.order_by('-created_at')
 
+    def list_etag(self, request):
+        # The cache key changes whenever the list does, and needs no query.
+        return version_etag(self.list_cache_key(request))
+
+    def is_search(self):
+        return self.action == 'list' and bool(self.request.query_params.get('q', '').strip())
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.is_search():
+            self._paginator = SearchRankCursorPagination()
+        return super().paginator
+
     def perform_create(self, serializer):
         serializer.save(mentor=self.request.user.userprofile)
     
@@ -45,6 +109,93 @@ class SkillViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def my_skills(self, request):
-        skills = Skill.objects.filter(mentor=request.user.userprofile)
-        serializer = self.get_serializer(skills, many=True)
+        skills = super().get_queryset().filter(mentor=request.user.userprofile)
+        page = self.paginate_queryset(skills)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        user_profile = request.user.userprofile
+        if user_profile.user_type != 'MENTOR':
+            raise PermissionDenied("Only mentors can create skills")
+        items = request.data
+        if not isinstance(items, list) or not 0 < len(items) <= BULK_MAX_ITEMS:
+            return Response({'error': f'Expected a list of 1 to {BULK_MAX_ITEMS} skills'},
+                          status=status.HTTP_400_BAD_REQUEST)
+
+        items = [SkillBulkItemSerializer(data=item) for item in items]
+        valid = [item.is_valid() for item in items]
+        category_ids = {item.validated_data.get('category') for item, ok in zip(items, valid) if ok} - {None}
+        known_categories = set(Category.objects.filter(id__in=category_ids).values_list('id', flat=True))
+
+        results, skills, tag_names = [], [], []
+        for index, (item, ok) in enumerate(zip(items, valid)):
+            data = dict(item.validated_data) if ok else {}
+            category = data.pop('category', None)
+            if not ok:
+                results.append({'index': index, 'errors': item.errors})
+            elif category is not None and category not in known_categories:
+                results.append({'index': index, 'errors': {'category': [f'Invalid pk "{category}" - object does not exist.']}})
+            else:
+                results.append({'index': index})
+                tag_names.append(data.pop('tags', []))
+                skills.append(Skill(mentor=user_profile, category_id=category, **data))
+
+        if skills:
+            with transaction.atomic():
+                Skill.objects.bulk_create_with_tags(skills, tag_names)
+                invalidate_summaries(user_profile.pk)
+            created = iter(skills)
+            for result in results:
+                if 'errors' not in result:
+                    result['id'] = next(created).pk
+
+        return Response(
+            {'created': len(skills), 'results': results},
+            status=status.HTTP_201_CREATED if skills else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=True, methods=['get'])
+    def related(self, request, pk=None):
+        return self.skills_by_id(related_skill_ids(pk, self.recommendation_limit()))
+
+    @action(detail=False, methods=['get'])
+    def recommended(self, request):
+        return self.skills_by_id(recommended_skill_ids(request.user.userprofile, self.recommendation_limit()))
+
+    def recommendation_limit(self):
+        try:
+            return max(1, min(int(self.request.query_params.get('limit', 10)), TOP_K))
+        except ValueError:
+            return 10
+
+    def skills_by_id(self, ids):
+        skills = super().get_queryset().exclude(mentor=self.request.user.userprofile).in_bulk(ids)
+        serializer = self.get_serializer([skills[pk] for pk in ids if pk in skills], many=True)
         return Response(serializer.data)
+
+
+@async_action(SkillViewSet, 'list')
+async def skill_list_async(view, request):
+    key = await sync_to_async(view.list_cache_key)(request)
+    etag = version_etag(key)
+    response = not_modified(request, etag)
+    if response is None:
+        data = await cache.aget(key)
+        if data is None:
+            data = (await apaginate(view, view.filter_queryset(view.get_queryset()))).data
+            await cache.aset(key, data, view.cache_timeout)
+        response = Response(data)
+    return with_validators(response, etag)
+
+
+@async_action(SkillViewSet, 'retrieve')
+async def skill_detail_async(view, request, pk):
+    validators = await sync_to_async(view.detail_validators)()
+    if validators is None:
+        return Response(view.get_serializer(await aget_object(view)).data)
+    response = not_modified(request, *validators)
+    if response is None:
+        response = Response(view.get_serializer(await aget_object(view)).data)
+    return with_validators(response, *validators)
@@ -0,0 +1,110 @@
+"""Async read endpoints, served under ``/api/async/``.
+
+DRF views are synchronous: under ASGI each request runs in a worker thread and
+holds it for as long as its queries take. ``async_action`` turns a coroutine
+into an async Django view backed by a viewset instance, so the viewset still
+builds the queryset, pagination links and serializers and the response is the
+same as the sync endpoint's. Single rows, aggregates and the message window
+are read with the async ORM (``aget``, ``aaggregate``, ``aiterator``). List
+pages are read by the paginator's own ``paginate_queryset``, and the ETag and
+cache-key helpers the sync views use run as they are; both go through
+``sync_to_async``. Either way the event loop is free to serve other requests
+while a query runs.
+
+Django still runs each async ORM call in a thread, but only for the duration
+of the query, and serializers never touch the database here because every
+relation they render is loaded up front. The profile is attached to the user
+before the handler runs, since async code cannot lazily load it.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from accounts.authentication import authenticate_async
+from accounts.models import UserProfile
+
+
+async def load_profile(user):
+    """Cache ``user.userprofile`` (or its absence) so async code can read it without a lazy query."""
+    related = User.userprofile.related
+    if not related.is_cached(user):
+        related.set_cached_value(user, await UserProfile.objects.filter(user=user).afirst())
+
+
+async def aget_object(view, queryset=None):
+    """``get_object`` using ``aget``."""
+    if queryset is None:
+        queryset = view.filter_queryset(view.get_queryset())
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        obj = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+    except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+    view.check_object_permissions(view.request, obj)
+    return obj
+
+
+async def apaginate(view, queryset, serializer_class=None):
+    """One page of ``queryset`` as the viewset's paginated response."""
+    page = await sync_to_async(view.paginator.paginate_queryset)(queryset, view.request, view=view)
+    serializer_class = serializer_class or view.get_serializer_class()
+    serializer = serializer_class(page, many=True, context=view.get_serializer_context())
+    return view.get_paginated_response(serializer.data)
+
+
+def render(view, response):
+    # A plain HttpResponse, so Django does not hop to a thread to render a TemplateResponse.
+    if not isinstance(response, Response):
+        return response
+    renderer = view.request.accepted_renderer
+    rendered = HttpResponse(
+        renderer.render(response.data, renderer.media_type, {'view': view, 'request': view.request}),
+        status=response.status_code, content_type=renderer.media_type,
+    )
+    for header, value in response.items():
+        if header.lower() != 'content-type':
+            rendered[header] = value
+    return rendered
+
+
+def async_action(viewset_class, action):
+    """Serve ``handler(view, request, **kwargs)`` as an async GET view.
+
+    ``view`` is a ``viewset_class`` instance set up as the router would for
+    ``action``, with the authenticated user and their profile on ``request``.
+    """
+    basename = viewset_class.queryset.model._meta.object_name.lower()
+
+    def decorator(handler):
+        @require_safe
+        @wraps(handler)
+        async def view_func(request, **kwargs):
+            user = await authenticate_async(request)
+            if user is not None:
+                await load_profile(user)
+            drf_request = Request(request)
+            drf_request.user = user or AnonymousUser()
+            view = viewset_class(
+                request=drf_request, args=(), kwargs=kwargs, action=action, basename=basename,
+                format_kwarg=None, headers={},
+            )
+            drf_request.accepted_renderer = view.renderer_classes[0]()
+            drf_request.accepted_media_type = drf_request.accepted_renderer.media_type
+            try:
+                if user is None:
+                    raise NotAuthenticated()
+                view.check_permissions(drf_request)
+                response = await handler(view, drf_request, **kwargs)
+            except Exception as exc:
+                response = view.handle_exception(exc)
+            return render(view, response)
+
+        return view_func
+    return decorator
@@ -0,0 +1,73 @@
+"""Generation-versioned caching.
+
+Cached entries are grouped into namespaces (``'skills'``, ``'profiles'``...),
+each with a generation counter kept in the cache. Every key embeds the current
+generation of the namespaces it depends on, so invalidating a namespace is a
+single ``incr``: entries from older generations are simply never read again
+and expire through their TTL, without any key scans or deletes.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+def generation_key(namespace):
+    return f'generation:{namespace}'
+
+
+def get_generations(namespaces):
+    keys = [generation_key(namespace) for namespace in namespaces]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # Seed from the clock so a counter lost to eviction or a restart
+            # can never line up with the generation of entries still cached.
+            cache.add(key, time.time_ns(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def invalidate(*namespaces):
+    """Bump the generation of ``namespaces`` once the current transaction commits."""
+    def bump():
+        for namespace in namespaces:
+            try:
+                cache.incr(generation_key(namespace))
+            except ValueError:
+                cache.add(generation_key(namespace), time.time_ns(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def versioned_key(name, namespaces, *parts):
+    generations = get_generations(namespaces)
+    digest = hashlib.md5(repr((generations, parts)).encode()).hexdigest()
+    return f'{name}:{digest}'
+
+
+class CachedListMixin:
+    """Serve a viewset's ``list`` from the cache.
+
+    Entries are keyed by host, path and query parameters plus the generations
+    of ``cache_dependencies``; invalidating any of those namespaces retires them.
+    """
+    cache_dependencies = ()
+    cache_timeout = 300
+
+    def list_cache_key(self, request):
+        # The path is part of the key because pagination links embed it.
+        return versioned_key(
+            f'{self.basename}:list', self.cache_dependencies,
+            request.get_host(), request.path, sorted(request.query_params.lists()),
+        )
+
+    def list(self, request, *args, **kwargs):
+        key = self.list_cache_key(request)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, self.cache_timeout)
+        return Response(data)
@@ -0,0 +1,107 @@
+"""Conditional GET (``ETag``/``Last-Modified``) from ``updated_at``.
+
+A representation's version is the newest timestamp of the rows it shows, plus
+whatever else changes it: the query string (sparse fieldsets, expansions,
+filters, cursors), the host and path that pagination links embed, the user
+the queryset is filtered for, and the generation of any cache namespace
+covering data without a timestamp. Checking it costs one narrow query, so an
+unchanged resource is answered with 304 before rows are loaded or serialized.
+
+Writes that bypass ``save()`` have to set ``updated_at`` themselves for this
+to notice them.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_generations
+
+
+def version_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def not_modified(request, etag, last_modified=None):
+    """A 304 response if the request's validators match, else None."""
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def with_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Clients may store it but must revalidate, and shared caches must not serve it to other users.
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def namespace_generations(namespaces):
+    return get_generations(namespaces) if namespaces else []
+
+
+def request_key(request):
+    return (request.user.pk, request.get_host(), request.path, sorted(request.query_params.lists()))
+
+
+def timestamp_validators(request, timestamps, namespaces=()):
+    """``(etag, last_modified)`` for a representation built from rows last changed at ``timestamps``."""
+    last_modified = max(timestamp for timestamp in timestamps if timestamp is not None)
+    etag = version_etag(request_key(request), tuple(timestamps), namespace_generations(namespaces))
+    return etag, int(last_modified.timestamp())
+
+
+class ConditionalGetMixin:
+    """Answer unchanged ``retrieve`` and ``list`` requests with 304.
+
+    ``retrieve`` reads only ``version_fields`` of the requested row and sends
+    both an ETag and Last-Modified. ``list`` aggregates the newest of each of
+    ``version_fields`` and the row count over the filtered queryset, so that
+    deletions count too, and sends only an ETag, because a deletion does not
+    move the newest timestamp.
+    """
+    # Timestamps of the row and of the related rows nested in its representation.
+    version_fields = ('updated_at',)
+    # Cache namespaces (see ``skillswap_backend.cache``) for nested data that has no timestamp.
+    version_namespaces = ()
+
+    def version_queryset(self):
+        return self.filter_queryset(self.get_queryset()).prefetch_related(None)
+
+    def detail_validators(self):
+        """``(etag, last_modified)`` for the requested row, or None if it is not visible to the request."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            timestamps = self.version_queryset().filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).values_list(*self.version_fields).first()
+        except (TypeError, ValueError, ValidationError):
+            return None
+        if timestamps is None:
+            return None
+        return timestamp_validators(self.request, timestamps, self.version_namespaces)
+
+    def list_etag(self, request):
+        aggregates = {f'latest_{index}': Max(field) for index, field in enumerate(self.version_fields)}
+        version = self.version_queryset().order_by().aggregate(count=Count('pk'), **aggregates)
+        return version_etag(request_key(request), sorted(version.items()),
+                            namespace_generations(self.version_namespaces))
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.detail_validators()
+        if validators is None:
+            # Let the full lookup produce the 404.
+            return super().retrieve(request, *args, **kwargs)
+        response = not_modified(request, *validators)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return with_validators(response, *validators)
+
+    def list(self, request, *args, **kwargs):
+        etag = self.list_etag(request)
+        response = not_modified(request, etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return with_validators(response, etag)
@@ -0,0 +1,98 @@
+"""Sparse fieldsets (``?fields=``) and relation expansion (``?expand=``).
+
+``?fields=id,title`` limits a response to the listed top-level fields.
+Relations named in a serializer's ``expandable_fields`` render compactly unless
+``?expand=`` names them. Dotted paths reach into nested serializers, e.g.
+``?expand=mentor,skill.mentor`` on a session.
+
+Viewsets using ``SparseQuerysetMixin`` only join the relations behind the
+fields that will actually be rendered.
+"""
+from rest_framework import permissions, serializers
+
+
+def split_param(request, name):
+    if request is None:
+        return None
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def subpaths(paths, name):
+    prefix = f'{name}.'
+    return {path[len(prefix):] for path in paths if path.startswith(prefix)}
+
+
+class SparseFieldsMixin:
+    """Serializer mixin applying ``?fields=`` and ``?expand=`` from the request.
+
+    Only the top-level serializer reads the query string; nested serializers get
+    their share of the expand paths from their parent.
+    """
+    # name -> serializer class used instead of the declared (compact) field when expanded
+    expandable_fields = {}
+    expand = None
+
+    def is_top_level(self):
+        return self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        top_level = self.is_top_level()
+
+        # Writes always see every field; ``?fields=`` only trims what is read back.
+        if top_level and request is not None and request.method in permissions.SAFE_METHODS:
+            requested = split_param(request, 'fields')
+            if requested:
+                fields = {name: field for name, field in fields.items() if name in requested}
+
+        expand = self.expand
+        if expand is None:
+            expand = (split_param(request, 'expand') if top_level else None) or set()
+
+        for name, field in list(fields.items()):
+            nested = subpaths(expand, name)
+            if name in self.expandable_fields and (name in expand or nested):
+                kwargs = {'read_only': True}
+                if field.source != name:
+                    kwargs['source'] = field.source
+                fields[name] = field = self.expandable_fields[name](**kwargs)
+            target = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(target, SparseFieldsMixin):
+                target.expand = nested
+        return fields
+
+
+class SparseQuerysetMixin:
+    """Viewset mixin that eager-loads only what the requested fields need.
+
+    ``select_related_fields`` / ``prefetch_related_fields`` map a serializer
+    field name to the relation paths it reads. Without ``?fields=`` every
+    mapped relation is loaded.
+    """
+    select_related_fields = {}
+    prefetch_related_fields = {}
+
+    def get_queryset(self):
+        return self.eager_load(super().get_queryset())
+
+    def eager_load(self, queryset):
+        requested = split_param(self.request, 'fields')
+        select_related = set()
+        prefetch_related = set()
+        for name, paths in self.select_related_fields.items():
+            if requested is None or name in requested:
+                select_related.update(paths)
+        for name, paths in self.prefetch_related_fields.items():
+            if requested is None or name in requested:
+                prefetch_related.update(paths)
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(prefetch_related))
+        return queryset
@@ -0,0 +1,216 @@
+"""Per-request performance instrumentation.
+
+``InstrumentationMiddleware`` records, for every request, the number of SQL
+queries and the time spent in them, the time spent building serializer output
+and the total time. The figures go out as a ``Server-Timing`` header (visible
+in the browser's network panel) and into Prometheus histograms served from
+``/metrics``, labelled by URL name, so each viewset action gets its own series.
+
+Queries slower than ``PERF_SLOW_QUERY_MS`` are logged to
+``skillswap.slow_queries`` along with the view that ran them.
+
+Queries are counted by an execute wrapper installed on every database
+connection as it opens, which reports to the request in ``current_metrics``.
+That context variable follows the request into the threads the async ORM runs
+queries in, so async views are measured the same way as sync ones. The
+middleware itself is sync and async capable and adds no thread hop to either.
+
+With ``PERF_INSTRUMENTATION`` off and no slow-query threshold the middleware
+removes itself at startup and nothing is patched, so it costs nothing.
+"""
+import logging
+import os
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+from rest_framework import serializers
+
+slow_query_logger = logging.getLogger('skillswap.slow_queries')
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float('inf'))
+
+current_metrics = ContextVar('request_metrics', default=None)
+_histograms = None
+
+
+class RequestMetrics:
+    def __init__(self, slow_query_seconds, request=None):
+        self.request = request
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.slow_query_seconds = slow_query_seconds
+
+    @property
+    def view(self):
+        match = getattr(self.request, 'resolver_match', None)
+        if match is None:
+            return None
+        return match.view_name or match.func.__name__
+
+    def __call__(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook timing every query."""
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - start
+            self.queries += 1
+            self.db_time += duration
+            if self.slow_query_seconds and duration >= self.slow_query_seconds:
+                slow_query_logger.warning(
+                    'Slow query (%.1f ms) in %s: %s', duration * 1000, self.view or '-', sql,
+                )
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def instrument_connections():
+    """Report the queries of every connection, in any thread, to the request in ``current_metrics``."""
+    connection_created.connect(install_query_recorder, dispatch_uid='skillswap.instrumentation')
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+
+def timed_data(prop):
+    """Wrap a serializer's ``data`` property so the outermost call is timed for the current request."""
+    def data(self):
+        metrics = current_metrics.get()
+        if metrics is None or metrics.serializing:
+            return prop.fget(self)
+        metrics.serializing = True
+        start = perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            metrics.serialize_time += perf_counter() - start
+            metrics.serializing = False
+
+    data.instrumented = True
+    return property(data)
+
+
+def instrument_serializers():
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data.fget, 'instrumented', False):
+            cls.data = timed_data(cls.data)
+
+
+def histograms():
+    global _histograms
+    if _histograms is None:
+        try:
+            from prometheus_client import Histogram
+        except ImportError:
+            raise ImproperlyConfigured('PERF_INSTRUMENTATION requires the prometheus-client package.')
+        _histograms = {
+            'total': Histogram(
+                'skillswap_request_duration_seconds', 'Total time to handle a request.',
+                ['view', 'method', 'status'],
+            ),
+            'db': Histogram('skillswap_request_db_seconds', 'Time spent in SQL queries per request.', ['view', 'method']),
+            'queries': Histogram(
+                'skillswap_request_db_queries', 'SQL queries per request.', ['view', 'method'],
+                buckets=QUERY_COUNT_BUCKETS,
+            ),
+            'serialize': Histogram(
+                'skillswap_request_serialize_seconds', 'Time spent building serializer output per request.',
+                ['view', 'method'],
+            ),
+        }
+    return _histograms
+
+
+def server_timing(metrics, total):
+    return ', '.join([
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+        f'serialize;dur={metrics.serialize_time * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ])
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.PERF_INSTRUMENTATION
+        slow_query_ms = settings.PERF_SLOW_QUERY_MS
+        if not self.enabled and not slow_query_ms:
+            raise MiddlewareNotUsed
+        self.slow_query_seconds = slow_query_ms / 1000 if slow_query_ms else None
+        if self.enabled:
+            histograms()
+            instrument_serializers()
+        instrument_connections()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics(self.slow_query_seconds, request)
+        token = current_metrics.set(metrics)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.record(request, response, metrics, perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics(self.slow_query_seconds, request)
+        token = current_metrics.set(metrics)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.record(request, response, metrics, perf_counter() - start)
+
+    def record(self, request, response, metrics, total):
+        if self.enabled:
+            view = metrics.view or '<unresolved>'
+            observed = histograms()
+            observed['total'].labels(view, request.method, response.status_code).observe(total)
+            observed['db'].labels(view, request.method).observe(metrics.db_time)
+            observed['queries'].labels(view, request.method).observe(metrics.queries)
+            observed['serialize'].labels(view, request.method).observe(metrics.serialize_time)
+            response['Server-Timing'] = server_timing(metrics, total)
+        return response
+
+
+def metrics_view(request):
+    """Prometheus exposition of the request histograms."""
+    if not settings.PERF_INSTRUMENTATION:
+        raise Http404
+    if settings.PERF_METRICS_TOKEN and request.headers.get('Authorization') != f'Bearer {settings.PERF_METRICS_TOKEN}':
+        return HttpResponse(status=401)
+
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    registry = REGISTRY
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        # Several gunicorn workers: merge the per-process files prometheus-client writes.
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
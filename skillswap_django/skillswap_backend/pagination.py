@@ -0,0 +1,22 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Default keyset pagination for list endpoints: newest first, ties broken by id.
+
+    Pages are fetched with ``WHERE created_at < <cursor>`` rather than ``OFFSET``,
+    and no ``COUNT(*)`` is issued, so deep pages cost the same as the first one.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class SearchRankCursorPagination(CreatedAtCursorPagination):
+    """Pages full-text search results by descending relevance ``rank``."""
+    ordering = ('-rank', '-id')
+
+
+class TagCursorPagination(CreatedAtCursorPagination):
+    ordering = ('-skill_count', 'slug')
@@ -0,0 +1,90 @@
+"""orjson-backed drop-ins for DRF's ``JSONRenderer`` and ``JSONParser``.
+
+The output matches ``JSONRenderer``'s, with compact separators, unescaped
+UTF-8 and U+2028/U+2029 escaped, except for float exponents: orjson writes
+``1e16`` and ``1e-7`` where ``json`` writes ``1e+16`` and ``1e-07``. Both parse
+to the same number. orjson encodes str, int, float, bool, None, dict and list
+(including subclasses such as ``ReturnDict``) and UUIDs itself. Everything
+else, including datetimes (``Z`` instead of ``+00:00``), Decimals, lazy
+translation strings and querysets, goes through DRF's ``JSONEncoder.default``,
+so it is converted exactly as before.
+
+When orjson cannot produce the same output, the stdlib renderer is used
+instead. That covers an indent (the browsable API asks for one), non-default
+``UNICODE_JSON``/``COMPACT_JSON`` settings, integers beyond 64 bits, and NaN
+and infinite floats or Decimals. orjson would write those as ``null``; the stdlib
+renderer raises ``ValueError`` for them under ``STRICT_JSON``, as before.
+Finding them means walking the data, so that only happens when the output
+contains a ``null``.
+
+``skillswap_backend.tests`` checks the compatibility, and ``python manage.py
+bench_json`` times both renderers on a real payload.
+"""
+import math
+from decimal import Decimal
+from io import BytesIO
+
+import orjson
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+# Datetimes and dataclasses go to DRF's encoder rather than orjson's own formatting.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+
+
+# Most values in a response; skipped by exact type before the slower isinstance checks.
+FINITE_SCALAR_TYPES = {str, int, bool, type(None)}
+
+
+def contains_non_finite_number(data):
+    """Whether ``data`` holds a NaN or infinite float or Decimal anywhere in its dicts, lists and tuples."""
+    stack = [data]
+    while stack:
+        values = stack.pop()
+        for value in (values.values() if isinstance(values, dict) else values):
+            if type(value) in FINITE_SCALAR_TYPES:
+                continue
+            if isinstance(value, (dict, list, tuple)):
+                stack.append(value)
+            elif isinstance(value, (float, Decimal)) and not math.isfinite(value):
+                return True
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson writes NaN and infinities as null.
+        if b'null' in ret and contains_non_finite_number([data]):
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer escapes these because they end a line in JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` on orjson. Unlike ``json``, orjson reads integers beyond 64 bits as floats."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8') or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Let the stdlib parser decide, so accepted input and error messages stay as they were.
+            return super().parse(BytesIO(body), media_type, parser_context)
+
@@ -36,10 +36,13 @@ INSTALLED_APPS = [
     'skills',
     'learning_sessions',
     'reviews',
+    'benchmarks',
 ]
 
 # Middleware
 MIDDLEWARE = [
+    # First, so its total covers every other middleware.
+    'skillswap_backend.instrumentation.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -71,12 +74,17 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'skillswap_backend.wsgi.application'
 
+# 'wsgi' (gunicorn sync workers) or 'asgi' (gunicorn with uvicorn workers); see start.sh.
+SERVER_PROFILE = os.environ.get("SERVER_PROFILE", "wsgi")
+
 # Database (Render or local)
 DATABASE_URL = os.environ.get("DATABASE_URL") or config("DATABASE_URL", default="")
 
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+        # Under ASGI each request runs in its own thread, so a persistent connection would
+        # never be reused and stay open until it times out.
+        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=0 if SERVER_PROFILE == 'asgi' else 600)
     }
 else:
     DATABASES = {
@@ -93,13 +101,26 @@ else:
 # DRF and JWT
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'skillswap_backend.pagination.CreatedAtCursorPagination',
+    # orjson drop-ins for DRF's JSONRenderer/JSONParser; list those instead to switch back.
+    'DEFAULT_RENDERER_CLASSES': [
+        'skillswap_backend.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'skillswap_backend.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+AUTHENTICATION_BACKENDS = ['accounts.backends.ProfileModelBackend']
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -136,9 +157,62 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_BEAT_SCHEDULE = {
+    # Reminders are queued with an ETA on approval; this sweep only catches stragglers.
     'send-session-reminders': {
         'task': 'learning_sessions.tasks.schedule_session_reminders',
-        'schedule': crontab(minute='*/5'),
+        'schedule': crontab(minute='*/10'),
+    },
+    'rebuild-skill-recommendations': {
+        'task': 'skills.tasks.rebuild_skill_recommendations',
+        'schedule': crontab(minute='*/30'),
+    },
+    # Incremental builds drift slightly; start from scratch once a night.
+    'rebuild-skill-recommendations-full': {
+        'task': 'skills.tasks.rebuild_skill_recommendations',
+        'schedule': crontab(hour=3, minute=15),
+        'kwargs': {'full': True},
+    },
+}
+
+# Cache (Redis when available, in-process otherwise, e.g. for tests)
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Session chat streaming
+CHAT_MESSAGE_BROKER = {
+    'BACKEND': os.environ.get('CHAT_MESSAGE_BROKER', 'learning_sessions.streaming.RedisMessageBroker'),
+    'OPTIONS': {'url': os.environ.get("REDIS_URL", "redis://localhost:6379/0")},
+}
+CHAT_STREAM_HEARTBEAT_SECONDS = 15
+# Streams need ASGI; under WSGI clients are told to poll ?after_id= instead.
+CHAT_STREAM_ENABLED = SERVER_PROFILE == 'asgi'
+CHAT_STREAM_TICKET_SECONDS = 60
+
+# Performance instrumentation: Server-Timing headers and /metrics (needs prometheus-client)
+PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "False") == "True"
+PERF_METRICS_TOKEN = os.environ.get("PERF_METRICS_TOKEN", "")
+# Log queries slower than this many milliseconds to skillswap.slow_queries; 0 disables.
+PERF_SLOW_QUERY_MS = float(os.environ.get("PERF_SLOW_QUERY_MS", 0))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'skillswap.slow_queries': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
     },
 }
 
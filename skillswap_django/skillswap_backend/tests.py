@@ -0,0 +1,114 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from accounts.models import UserProfile
+from learning_sessions.models import LearningSession
+from learning_sessions.serializers import LearningSessionSerializer
+from skills.models import Category, Skill
+
+from .renderers import ORJSONParser, ORJSONRenderer
+
+# Values the API can hand a renderer besides what serializers produce, each rendered on its own.
+EDGE_CASES = {
+    'decimal': Decimal('12.50'),
+    'aware-datetime': datetime.datetime(2026, 3, 1, 9, 30, 15, 250000, tzinfo=datetime.timezone.utc),
+    'offset-datetime': datetime.datetime(2026, 3, 1, 9, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=5))),
+    'naive-datetime': datetime.datetime(2026, 3, 1, 9, 30),
+    'date': datetime.date(2026, 3, 1),
+    'time': datetime.time(9, 30, 15),
+    'timedelta': datetime.timedelta(minutes=90),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy-string': gettext_lazy('This field is required.'),
+    'unicode': 'Grüße, 日本語, emoji \U0001f600',
+    'line-separators': 'line\u2028paragraph\u2029end',
+    'control-characters': 'tab\tnewline\nquote" backslash\\ nul\x00',
+    'return-dict': ReturnDict({'nested': [1, 2.5, None, True]}, serializer=None),
+    'int-keys': {1: 'one', 2: 'two'},
+    'tuple': (1, 'two', 3.0),
+    'big-int': 2 ** 70,
+    'float': 4.333333333333333,
+    'empty': {},
+    'null': None,
+}
+
+# orjson drops the exponent's sign and leading zero; both forms parse to the same number.
+FLOAT_EXPONENTS = [1e16, 1.5e-7, -2.5e300]
+
+NON_FINITE = {
+    'nan': float('nan'),
+    'infinity': float('inf'),
+    'negative-infinity': float('-inf'),
+    'nested-infinity': {'results': [{'score': float('inf')}], 'next': None},
+    'decimal-nan': Decimal('NaN'),
+}
+
+
+class ORJSONRendererTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        mentor, learner = (
+            UserProfile.objects.create(
+                user=User.objects.create_user(username, first_name=username.title()), user_type=user_type,
+            )
+            for username, user_type in (('mentor', 'MENTOR'), ('learner', 'LEARNER'))
+        )
+        category = Category.objects.create(name='Languages')
+        skill = Skill.objects.create(
+            mentor=mentor, category=category, title='Conversational Japanese \u2028 日本語',
+            description='Line\u2028and paragraph\u2029separators', level='BEGINNER', duration_minutes=45,
+        )
+        skill.set_tags('japanese, speaking')
+        for days in (1, 2, 3):
+            LearningSession.objects.create(
+                skill=skill, learner=learner, mentor=mentor,
+                scheduled_datetime=timezone.now() + datetime.timedelta(days=days),
+                learner_message='Quote " backslash \\ emoji \U0001f600',
+            )
+
+    def session_page(self):
+        sessions = LearningSession.objects.select_related(
+            'skill__mentor__user', 'skill__category', 'learner__user', 'mentor__user',
+        ).prefetch_related('skill__tags')
+        results = LearningSessionSerializer(sessions, many=True).data
+        return ReturnDict({'next': None, 'previous': None, 'results': results}, serializer=None)
+
+    def test_session_page_matches_json_renderer(self):
+        page = self.session_page()
+        self.assertEqual(ORJSONRenderer().render(page), JSONRenderer().render(page))
+
+    def test_edge_cases_match_json_renderer(self):
+        for name, value in EDGE_CASES.items():
+            with self.subTest(name):
+                self.assertEqual(ORJSONRenderer().render(value), JSONRenderer().render(value))
+
+    def test_float_exponents_parse_to_the_same_number(self):
+        for value in FLOAT_EXPONENTS:
+            with self.subTest(value):
+                self.assertEqual(
+                    json.loads(ORJSONRenderer().render([value])), json.loads(JSONRenderer().render([value]))
+                )
+
+    def test_non_finite_numbers_raise_like_json_renderer(self):
+        for name, value in NON_FINITE.items():
+            with self.subTest(name):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(value)
+                with self.assertRaises(ValueError):
+                    ORJSONRenderer().render(value)
+
+
+class ORJSONParserTests(TestCase):
+    def test_parses_like_json_parser(self):
+        body = JSONRenderer().render({key: value for key, value in EDGE_CASES.items() if key != 'big-int'})
+        self.assertEqual(ORJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
@@ -1,28 +1,55 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
-from accounts.views import RegisterView, CustomTokenObtainPairView, profile_view
-from skills.views import CategoryViewSet, SkillViewSet
-from learning_sessions.views import LearningSessionViewSet
-from reviews.views import ReviewViewSet
+from accounts.views import (
+    AvailabilityExceptionViewSet, AvailabilitySlotViewSet, RegisterView, CustomTokenObtainPairView, profile_image_variant,
+    profile_view,
+)
+from accounts.images import VARIANT_DIR
+from skills.views import CategoryViewSet, SkillViewSet, TagViewSet, skill_detail_async, skill_list_async
+from learning_sessions.views import (
+    LearningSessionViewSet, mentor_free_slots, my_summary, session_list_async, session_message_stream,
+    session_messages_async,
+)
+from reviews.views import LeaderboardView, ReviewViewSet, reviews_for_user_async
+from skillswap_backend.instrumentation import metrics_view
 from django.http import JsonResponse
 
 router = DefaultRouter()
 router.register(r'categories', CategoryViewSet)
 router.register(r'skills', SkillViewSet)
+router.register(r'tags', TagViewSet)
 router.register(r'sessions', LearningSessionViewSet)
 router.register(r'reviews', ReviewViewSet)
+router.register(r'availability/slots', AvailabilitySlotViewSet)
+router.register(r'availability/exceptions', AvailabilityExceptionViewSet)
 
 urlpatterns = [
     path("", lambda request: JsonResponse({"message": "SkillSwap API is live!"})),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('api/auth/register/', RegisterView.as_view(), name='register'),
     path('api/auth/login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/profile/', profile_view, name='profile'),
+    # Ahead of the DEBUG media route, so variants get their cache headers in development too.
+    re_path(
+        rf'^{settings.MEDIA_URL.lstrip("/")}{VARIANT_DIR}/(?P<name>[0-9a-f]{{32}}\.(?:webp|jpg))$',
+        profile_image_variant, name='profile-image-variant',
+    ),
+    path('api/me/summary/', my_summary, name='my-summary'),
+    path('api/sessions/<int:pk>/stream/', session_message_stream, name='session-message-stream'),
+    path('api/mentors/<int:pk>/free-slots/', mentor_free_slots, name='mentor-free-slots'),
+    path('api/leaderboard/', LeaderboardView.as_view(), name='mentor-leaderboard'),
+    # Async twins of the hot read endpoints; they only pay off when served through ASGI.
+    path('api/async/skills/', skill_list_async, name='async-skill-list'),
+    path('api/async/skills/<int:pk>/', skill_detail_async, name='async-skill-detail'),
+    path('api/async/sessions/', session_list_async, name='async-session-list'),
+    path('api/async/sessions/<int:pk>/messages/', session_messages_async, name='async-session-messages'),
+    path('api/async/reviews/for_user/', reviews_for_user_async, name='async-review-for-user'),
     path('api/', include(router.urls)),
 ]
 
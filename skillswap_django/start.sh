@@ -0,0 +1,17 @@
+#!/usr/bin/env sh
+# Start the web server for SERVER_PROFILE: "wsgi" (default) or "asgi".
+# Both use gunicorn, so WEB_CONCURRENCY sets the worker count either way.
+set -e
+
+case "${SERVER_PROFILE:-wsgi}" in
+  wsgi)
+    exec gunicorn skillswap_backend.wsgi:application "$@"
+    ;;
+  asgi)
+    exec gunicorn skillswap_backend.asgi:application -k uvicorn.workers.UvicornWorker "$@"
+    ;;
+  *)
+    echo "Unknown SERVER_PROFILE '$SERVER_PROFILE' (expected wsgi or asgi)" >&2
+    exit 1
+    ;;
+esac
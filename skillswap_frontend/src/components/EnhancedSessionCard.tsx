@@ -75,9 +75,9 @@ export default function EnhancedSessionCard({ session }: EnhancedSessionCardProp
                 <User className="w-4 h-4 text-gray-500" />
                 <span className="text-sm text-gray-600">
                   {isMentor ? (
-                    <>Learning with {session.learner.user.first_name || session.learner.user.username}</>
+                    <>Learning with {session.learner.display_name}</>
                   ) : (
-                    <>Mentored by {session.mentor.user.first_name || session.mentor.user.username}</>
+                    <>Mentored by {session.mentor.display_name}</>
                   )}
                 </span>
               </div>
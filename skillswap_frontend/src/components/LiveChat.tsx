@@ -5,7 +5,7 @@ import { Input } from '@/components/ui/input';
 import { Send, MessageCircle } from 'lucide-react';
 import { useAuth } from '@/contexts/AuthContext';
 import { Session } from '@/hooks/useSessions';
-import api from '@/lib/api';
+import api, { pageResults } from '@/lib/api';
 
 interface Message {
   id: number;
@@ -22,6 +22,8 @@ interface Message {
   created_at: string;
 }
 
+const POLL_INTERVAL_MS = 3000;
+
 interface LiveChatProps {
   session: Session;
   isOpen: boolean;
@@ -34,32 +36,92 @@ export default function LiveChat({ session, isOpen, onClose }: LiveChatProps) {
   const [newMessage, setNewMessage] = useState('');
   const [loading, setLoading] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const lastIdRef = useRef(0);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   };
 
   useEffect(() => {
-    if (isOpen && session) {
-      fetchMessages();
-      const interval = setInterval(fetchMessages, 3000);
-      return () => clearInterval(interval);
-    }
+    if (!isOpen || !session) return;
+    let closed = false;
+    let source: EventSource | null = null;
+    let poll: ReturnType<typeof setInterval> | null = null;
+    let retry: ReturnType<typeof setTimeout> | null = null;
+
+    const startPolling = () => {
+      poll ??= setInterval(fetchNewMessages, POLL_INTERVAL_MS);
+    };
+
+    // New messages are pushed over Server-Sent Events when the server supports it.
+    // EventSource can't send headers, so it connects with a short-lived stream ticket
+    // rather than the access token; without streaming, fall back to polling for deltas.
+    const connect = async () => {
+      try {
+        const response = await api.post(`/sessions/${session.id}/stream-ticket/`);
+        if (closed) return;
+        source = new EventSource(
+          `${api.defaults.baseURL}/sessions/${session.id}/stream/?ticket=${encodeURIComponent(response.data.ticket)}`
+        );
+        source.addEventListener('message', (event) => {
+          appendMessages([JSON.parse((event as MessageEvent).data)]);
+        });
+        source.onerror = () => {
+          // The browser retries dropped connections itself; CLOSED means the ticket was refused.
+          if (source?.readyState !== EventSource.CLOSED || closed) return;
+          source = null;
+          fetchNewMessages();
+          retry = setTimeout(connect, POLL_INTERVAL_MS);
+        };
+      } catch {
+        if (!closed) startPolling();
+      }
+    };
+
+    fetchMessages();
+    connect();
+    return () => {
+      closed = true;
+      source?.close();
+      if (poll) clearInterval(poll);
+      if (retry) clearTimeout(retry);
+    };
   }, [isOpen, session]);
 
   useEffect(() => {
     scrollToBottom();
   }, [messages]);
 
+  const appendMessages = (incoming: Message[]) => {
+    for (const message of incoming) {
+      lastIdRef.current = Math.max(lastIdRef.current, message.id);
+    }
+    setMessages(prev => [...prev, ...incoming.filter(message => !prev.some(m => m.id === message.id))]);
+  };
+
   const fetchMessages = async () => {
     try {
       const response = await api.get(`/sessions/${session.id}/messages/`);
-      setMessages(response.data);
+      // Pages come newest-first; the chat renders oldest at the top.
+      const history = pageResults<Message>(response.data).reverse();
+      lastIdRef.current = history.length ? history[history.length - 1].id : 0;
+      setMessages(history);
     } catch (error) {
       console.error('Failed to fetch messages:', error);
     }
   };
 
+  const fetchNewMessages = async () => {
+    try {
+      const response = await api.get(`/sessions/${session.id}/messages/`, {
+        params: { after_id: lastIdRef.current },
+      });
+      appendMessages(response.data.results);
+    } catch (error) {
+      console.error('Failed to fetch new messages:', error);
+    }
+  };
+
   const sendMessage = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!newMessage.trim()) return;
@@ -70,7 +132,7 @@ export default function LiveChat({ session, isOpen, onClose }: LiveChatProps) {
         message: newMessage.trim(),
       });
       
-      setMessages(prev => [...prev, response.data]);
+      appendMessages([response.data]);
       setNewMessage('');
     } catch (error) {
       console.error('Failed to send message:', error);
@@ -102,7 +164,7 @@ export default function LiveChat({ session, isOpen, onClose }: LiveChatProps) {
             </Button>
           </div>
           <div className="text-sm text-gray-600">
-            {session.skill.title} - {session.mentor.user.first_name} & {session.learner.user.first_name}
+            {session.skill.title} - {session.mentor.display_name} & {session.learner.display_name}
           </div>
         </CardHeader>
         
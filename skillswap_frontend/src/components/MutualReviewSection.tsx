@@ -44,7 +44,7 @@ export default function MutualReviewSection({ session }: MutualReviewSectionProp
               <div className="flex items-center gap-2 mb-2">
                 <User className="w-4 h-4" />
                 <span className="font-medium">
-                  Review by {session.mentor.user.first_name || session.mentor.user.username} (Mentor)
+                  Review by {session.mentor.display_name} (Mentor)
                 </span>
               </div>
               <div className="space-y-2">
@@ -73,7 +73,7 @@ export default function MutualReviewSection({ session }: MutualReviewSectionProp
               <div className="flex items-center gap-2 mb-2">
                 <User className="w-4 h-4" />
                 <span className="font-medium">
-                  Review by {session.learner.user.first_name || session.learner.user.username} (Learner)
+                  Review by {session.learner.display_name} (Learner)
                 </span>
               </div>
               <div className="space-y-2">
@@ -110,14 +110,14 @@ export default function MutualReviewSection({ session }: MutualReviewSectionProp
                     className="mb-3"
                   >
                     <Star className="w-4 h-4 mr-2" />
-                    Review {session.learner.user.first_name || session.learner.user.username} (Learner)
+                    Review {session.learner.display_name} (Learner)
                   </Button>
                   
                   {showReviewLearner && (
                     <ReviewForm
                       session={session}
                       reviewedUserId={session.learner.id}
-                      reviewedUserName={session.learner.user.first_name || session.learner.user.username}
+                      reviewedUserName={session.learner.display_name}
                       onSuccess={() => setShowReviewLearner(false)}
                     />
                   )}
@@ -132,14 +132,14 @@ export default function MutualReviewSection({ session }: MutualReviewSectionProp
                     className="mb-3"
                   >
                     <Star className="w-4 h-4 mr-2" />
-                    Review {session.mentor.user.first_name || session.mentor.user.username} (Mentor)
+                    Review {session.mentor.display_name} (Mentor)
                   </Button>
                   
                   {showReviewMentor && (
                     <ReviewForm
                       session={session}
                       reviewedUserId={session.mentor.id}
-                      reviewedUserName={session.mentor.user.first_name || session.mentor.user.username}
+                      reviewedUserName={session.mentor.display_name}
                       onSuccess={() => setShowReviewMentor(false)}
                     />
                   )}
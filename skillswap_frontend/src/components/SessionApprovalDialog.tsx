@@ -64,7 +64,7 @@ export default function SessionApprovalDialog({
           <DialogDescription>
             {session && (
               <>
-                Session with {session.learner.user.first_name || session.learner.user.username} for{' '}
+                Session with {session.learner.display_name} for{' '}
                 <strong>{session.skill.title}</strong>
               </>
             )}
@@ -79,7 +79,7 @@ export default function SessionChat({ session }: SessionChatProps) {
                     }`}
                   >
                     <div className="text-sm font-medium mb-1">
-                      {message.sender_name || message.sender.user.username}
+                      {message.sender_name || message.sender.display_name}
                     </div>
                     <div className="text-sm">{message.message}</div>
                     <div className="text-xs opacity-75 mt-1">
@@ -13,6 +13,8 @@ interface User {
   user_type: 'MENTOR' | 'LEARNER';
   bio: string;
   profile_image: string | null;
+  // size ('small' 64px, 'medium' 256px, 'large' 512px) -> format -> URL; empty until processed
+  profile_image_variants: Record<string, { webp: string; jpeg: string }>;
   timezone: string;
   average_rating: number;
   review_count: number;
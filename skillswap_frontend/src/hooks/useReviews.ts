@@ -1,25 +1,11 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { api } from '@/lib/api';
+import { api, pageResults, ProfileSummary } from '@/lib/api';
 
 export interface Review {
   id: number;
   session: number;
-  reviewer: {
-    id: number;
-    user: {
-      username: string;
-      first_name: string;
-      last_name: string;
-    };
-  };
-  reviewed: {
-    id: number;
-    user: {
-      username: string;
-      first_name: string;
-      last_name: string;
-    };
-  };
+  reviewer: ProfileSummary;
+  reviewed: ProfileSummary;
   reviewer_name: string;
   rating: number;
   comment: string;
@@ -38,7 +24,7 @@ export const useReviews = () => {
     queryKey: ['reviews'],
     queryFn: async () => {
       const response = await api.get('/reviews/');
-      return response.data;
+      return pageResults(response.data);
     },
   });
 };
@@ -48,7 +34,7 @@ export const useUserReviews = (userId: number) => {
     queryKey: ['reviews', 'user', userId],
     queryFn: async () => {
       const response = await api.get(`/reviews/for_user/?user_id=${userId}`);
-      return response.data;
+      return pageResults(response.data);
     },
     enabled: !!userId,
   });
@@ -74,7 +60,7 @@ export const useSessionReviews = (sessionId: number) => {
     queryKey: ['reviews', 'session', sessionId],
     queryFn: async () => {
       const response = await api.get(`/reviews/?session=${sessionId}`);
-      return response.data;
+      return pageResults(response.data);
     },
     enabled: !!sessionId,
   });
@@ -1,17 +1,10 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { api } from '@/lib/api';
+import { api, pageResults, ProfileSummary } from '@/lib/api';
 
 export interface SessionMessage {
   id: number;
   session: number;
-  sender: {
-    id: number;
-    user: {
-      username: string;
-      first_name: string;
-      last_name: string;
-    };
-  };
+  sender: ProfileSummary;
   sender_name: string;
   message: string;
   created_at: string;
@@ -22,7 +15,7 @@ export const useSessionMessages = (sessionId: number) => {
     queryKey: ['session-messages', sessionId],
     queryFn: async () => {
       const response = await api.get(`/sessions/${sessionId}/messages/`);
-      return response.data;
+      return pageResults(response.data).reverse();
     },
     enabled: !!sessionId,
     refetchInterval: 5000,
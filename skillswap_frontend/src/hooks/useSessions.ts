@@ -1,5 +1,5 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import api from '@/lib/api';
+import api, { pageResults, ProfileSummary } from '@/lib/api';
 
 export interface Session {
   id: number;
@@ -9,22 +9,8 @@ export interface Session {
     description: string;
     category_name: string;
   };
-  learner: {
-    id: number;
-    user: {
-      username: string;
-      first_name: string;
-      last_name: string;
-    };
-  };
-  mentor: {
-    id: number;
-    user: {
-      username: string;
-      first_name: string;
-      last_name: string;
-    };
-  };
+  learner: ProfileSummary;
+  mentor: ProfileSummary;
   scheduled_datetime: string;
   status: 'PENDING' | 'APPROVED' | 'REJECTED' | 'COMPLETED' | 'CANCELLED';
   learner_message: string;
@@ -40,6 +26,39 @@ export const useSessions = () => {
     queryKey: ['sessions'],
     queryFn: async () => {
       const response = await api.get('/sessions/');
+      return pageResults(response.data);
+    },
+  });
+};
+
+type StatusCounts = Record<Session['status'] | 'total', number>;
+
+export interface MySummary {
+  sessions: { learner: StatusCounts; mentor: StatusCounts };
+  upcoming: {
+    id: number;
+    skill_title: string;
+    scheduled_datetime: string;
+    ends_at: string;
+    role: 'learner' | 'mentor';
+    with_profile: ProfileSummary;
+  }[];
+  unreviewed_completed: number;
+  skills: number;
+  ratings: {
+    average: number;
+    count: number;
+    given: number;
+    distribution: Record<'1' | '2' | '3' | '4' | '5', number>;
+  };
+}
+
+// Keyed under 'sessions' so every session mutation refreshes it too.
+export const useMySummary = () => {
+  return useQuery({
+    queryKey: ['sessions', 'summary'],
+    queryFn: async () => {
+      const response = await api.get<MySummary>('/me/summary/');
       return response.data;
     },
   });
@@ -50,7 +69,7 @@ export const useSessionsAsLearner = () => {
     queryKey: ['sessions-learner'],
     queryFn: async () => {
       const response = await api.get('/sessions/as_learner/');
-      return response.data;
+      return pageResults(response.data);
     },
   });
 };
@@ -60,7 +79,7 @@ export const useSessionsAsMentor = () => {
     queryKey: ['sessions-mentor'],
     queryFn: async () => {
       const response = await api.get('/sessions/as_mentor/');
-      return response.data;
+      return pageResults(response.data);
     },
   });
 };
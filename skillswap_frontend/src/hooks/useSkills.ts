@@ -1,5 +1,5 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import api from '@/lib/api';
+import api, { pageResults } from '@/lib/api';
 
 export interface Category {
   id: number;
@@ -50,9 +50,10 @@ export const useSkills = (category?: string, level?: string) => {
       const params = new URLSearchParams();
       if (category) params.append('category', category);
       if (level) params.append('level', level);
+      params.append('expand', 'mentor');
       
       const response = await api.get(`/skills/?${params.toString()}`);
-      return response.data;
+      return pageResults(response.data);
     },
   });
 };
@@ -62,7 +63,7 @@ export const useMySkills = () => {
     queryKey: ['my-skills'],
     queryFn: async () => {
       const response = await api.get('/skills/my_skills/');
-      return response.data;
+      return pageResults(response.data);
     },
   });
 };
@@ -78,6 +79,7 @@ export const useCreateSkill = () => {
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['skills'] });
       queryClient.invalidateQueries({ queryKey: ['my-skills'] });
+      queryClient.invalidateQueries({ queryKey: ['sessions', 'summary'] });
     },
   });
 };
@@ -93,6 +95,7 @@ export const useUpdateSkill = () => {
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['skills'] });
       queryClient.invalidateQueries({ queryKey: ['my-skills'] });
+      queryClient.invalidateQueries({ queryKey: ['sessions', 'summary'] });
     },
   });
 };
@@ -107,6 +110,7 @@ export const useDeleteSkill = () => {
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['skills'] });
       queryClient.invalidateQueries({ queryKey: ['my-skills'] });
+      queryClient.invalidateQueries({ queryKey: ['sessions', 'summary'] });
     },
   });
 };
@@ -48,4 +48,20 @@ api.interceptors.response.use(
   }
 );
 
+// Nested profiles arrive in this compact form unless requested with ?expand=.
+export interface ProfileSummary {
+  id: number;
+  display_name: string;
+}
+
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+// List endpoints are cursor-paginated; unwrap the current page's rows.
+export const pageResults = <T>(data: CursorPage<T> | T[]): T[] =>
+  Array.isArray(data) ? data : data.results;
+
 export default api;
@@ -1,6 +1,6 @@
 import { useState } from 'react';
 import { useAuth } from '@/contexts/AuthContext';
-import { useSessionsAsLearner, useSessionsAsMentor } from '@/hooks/useSessions';
+import { useMySummary, useSessionsAsLearner, useSessionsAsMentor } from '@/hooks/useSessions';
 import { useMySkills, useDeleteSkill } from '@/hooks/useSkills';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
@@ -17,6 +17,7 @@ export default function DashboardPage() {
   const { data: learnerSessions = [] } = useSessionsAsLearner();
   const { data: mentorSessions = [] } = useSessionsAsMentor();
   const { data: mySkills = [] } = useMySkills();
+  const { data: summary } = useMySummary();
   const deleteSkill = useDeleteSkill();
   
   const [editingSkill, setEditingSkill] = useState<Skill | null>(null);
@@ -71,7 +72,7 @@ export default function DashboardPage() {
           </CardHeader>
           <CardContent>
             <div className="text-2xl font-bold">
-              {user?.user_type === 'MENTOR' ? mySkills.length : learnerSessions.length}
+              {user?.user_type === 'MENTOR' ? summary?.skills ?? 0 : summary?.sessions.learner.total ?? 0}
             </div>
           </CardContent>
         </Card>
@@ -85,9 +86,9 @@ export default function DashboardPage() {
           </CardHeader>
           <CardContent>
             <div className="text-2xl font-bold">
-              {user?.user_type === 'MENTOR' 
-                ? mentorSessions.length 
-                : learnerSessions.filter((s: any) => s.status === 'COMPLETED').length}
+              {user?.user_type === 'MENTOR'
+                ? summary?.sessions.mentor.total ?? 0
+                : summary?.sessions.learner.COMPLETED ?? 0}
             </div>
           </CardContent>
         </Card>
@@ -99,7 +100,7 @@ export default function DashboardPage() {
           </CardHeader>
           <CardContent>
             <div className="text-2xl font-bold">
-              {user?.average_rating?.toFixed(1) || '0.0'}
+              {summary?.ratings.average.toFixed(1) ?? '0.0'}
             </div>
           </CardContent>
         </Card>
@@ -110,7 +111,7 @@ export default function DashboardPage() {
             <Clock className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold">{user?.review_count || 0}</div>
+            <div className="text-2xl font-bold">{summary?.ratings.count ?? 0}</div>
           </CardContent>
         </Card>
       </div>
@@ -28,7 +28,7 @@ export default function SkillDetailPage() {
   const { data: skill, isLoading } = useQuery({
     queryKey: ['skill', id],
     queryFn: async () => {
-      const response = await api.get(`/skills/${id}/`);
+      const response = await api.get(`/skills/${id}/?expand=mentor`);
       return response.data;
     },
   });
@@ -62,7 +62,7 @@ export default function SkillDetailPage() {
       setLearnerMessage('');
       alert('Session booked successfully! The mentor will review your request.');
     } catch (err: any) {
-      setError(err.response?.data?.detail || 'Failed to book session');
+      setError(err.response?.data?.scheduled_datetime?.[0] || err.response?.data?.detail || 'Failed to book session');
     }
   };
 